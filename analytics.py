@@ -0,0 +1,132 @@
+# analytics.py
+from statistics import NormalDist
+
+import numpy as np
+
+TRADING_DAYS = 252
+MIN_BARS = 10
+
+
+# ---------------- PRICE MATRIX ----------------
+def right_align(prices: np.ndarray) -> np.ndarray:
+    # Push every column's valid values to the bottom so that row -1 is the
+    # latest bar and each column is a contiguous series (like dropna()).
+    prices = np.asarray(prices, dtype=float)
+    order = np.argsort(~np.isnan(prices), axis=0, kind="stable")
+    return np.take_along_axis(prices, order, axis=0)
+
+
+# ---------------- VECTORIZED METRICS ----------------
+def annualized_volatility(prices: np.ndarray, periods_per_year: float = TRADING_DAYS) -> np.ndarray:
+    prices = right_align(prices)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        returns = prices[1:] / prices[:-1] - 1.0
+        counts = np.sum(~np.isnan(returns), axis=0)
+        mean = np.nansum(returns, axis=0) / np.maximum(counts, 1)
+        var = np.nansum((returns - mean) ** 2, axis=0) / (counts - 1)
+    vol = np.sqrt(var) * np.sqrt(periods_per_year)
+    return np.where(counts > 1, vol, 0.0)
+
+
+def ols_fit(prices: np.ndarray):
+    # Closed-form least squares of price on bar index (0..n-1), one fit per
+    # column. Accepts one series or a (bars x series) matrix and returns
+    # (slope, intercept, r2, n) with the same shape as the input's columns.
+    prices = np.asarray(prices, dtype=float)
+    single = prices.ndim == 1
+    if single:
+        prices = prices[:, None]
+
+    prices = right_align(prices)
+    rows = prices.shape[0]
+    valid = ~np.isnan(prices)
+    n = valid.sum(axis=0)
+
+    x = np.arange(rows, dtype=float)[:, None] - (rows - n)[None, :]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x_mean = (n - 1) / 2.0
+        y_mean = np.where(valid, prices, 0.0).sum(axis=0) / n
+        dx = np.where(valid, x - x_mean, 0.0)
+        dy = np.where(valid, prices - y_mean, 0.0)
+
+        sxx = (dx * dx).sum(axis=0)
+        sxy = (dx * dy).sum(axis=0)
+        syy = (dy * dy).sum(axis=0)
+
+        slope = sxy / sxx
+        intercept = y_mean - slope * x_mean
+        # A flat series is fitted exactly, which sklearn scores as 1.0
+        r2 = np.where(syy > 0, slope * sxy / syy, 1.0)
+
+    if single:
+        return slope[0], intercept[0], r2[0], int(n[0])
+    return slope, intercept, r2, n
+
+
+def trend_forecast(prices: np.ndarray):
+    # Next-bar forecast from the linear trend. Returns (next_price, r2 * 100,
+    # n_bars); fits on fewer than MIN_BARS bars come back as zeros.
+    slope, intercept, r2, n = ols_fit(prices)
+    next_price = intercept + slope * n
+
+    bad = (n < MIN_BARS) | np.isnan(next_price) | np.isnan(r2)
+    return np.where(bad, 0.0, next_price), np.where(bad, 0.0, r2 * 100), n
+
+
+def classify_risk(volatility: np.ndarray) -> np.ndarray:
+    volatility = np.asarray(volatility, dtype=float)
+    return np.where(
+        volatility > 0.4, "high",
+        np.where(volatility > 0.2, "medium", "low"),
+    )
+
+
+def summarize(prices: np.ndarray):
+    # Everything /chat/batch needs in one call, so it can run in a worker
+    prices = right_align(prices)
+    volatility = annualized_volatility(prices)
+    predicted, confidence, _ = trend_forecast(prices)
+    return prices[-1], volatility, predicted, confidence, classify_risk(volatility)
+
+
+# ---------------- PORTFOLIO RISK ----------------
+def portfolio_risk(returns: np.ndarray, weights: np.ndarray, confidence: float = 0.95) -> dict:
+    # returns is an aligned (bars x assets) matrix of daily simple returns,
+    # weights sum to 1. VaR / CVaR are one-day losses as a fraction of the
+    # portfolio value; volatility and covariance are annualized.
+    returns = np.asarray(returns, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+
+    cov = np.cov(returns, rowvar=False, ddof=1).reshape(len(weights), len(weights))
+    std = np.sqrt(np.diag(cov))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = np.where(np.outer(std, std) > 0, cov / np.outer(std, std), 0.0)
+    np.fill_diagonal(corr, 1.0)
+
+    sigma = float(np.sqrt(weights @ cov @ weights))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        marginal = np.where(sigma > 0, cov @ weights / sigma, 0.0)
+    component = weights * marginal
+
+    # Historical: empirical quantile of the portfolio's daily losses
+    losses = -(returns @ weights)
+    hist_var = float(np.quantile(losses, confidence))
+    hist_cvar = float(losses[losses >= hist_var].mean())
+
+    # Parametric: normal losses with the sample mean and covariance
+    mu = float(returns.mean(axis=0) @ weights)
+    z = NormalDist().inv_cdf(confidence)
+    param_var = sigma * z - mu
+    param_cvar = sigma * NormalDist().pdf(z) / (1 - confidence) - mu
+
+    return {
+        "volatility": sigma * np.sqrt(TRADING_DAYS),
+        "covariance": cov * TRADING_DAYS,
+        "correlation": corr,
+        "var": {"historical": hist_var, "parametric": param_var},
+        "cvar": {"historical": hist_cvar, "parametric": param_cvar},
+        "marginal": marginal * np.sqrt(TRADING_DAYS),
+        "component": component * np.sqrt(TRADING_DAYS),
+        "percent": component / sigma * 100 if sigma > 0 else np.zeros_like(component),
+    }
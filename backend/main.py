@@ -3,11 +3,19 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import yfinance as yf
-import pandas as pd
 import numpy as np
-from sklearn.linear_model import LinearRegression
 from datetime import datetime
 import os
+import sys
+
+# Shared engine modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analytics
+import execution
+import markets
+from history import history_sink
+from intents import intent_engine
 
 app = FastAPI(title="AI Stock Market Assistant API")
 
@@ -22,6 +30,8 @@ app.add_middleware(
 class StockQuery(BaseModel):
     stock: str
     question: str
+    # 1m, 5m, 15m or 1d bars
+    interval: str = "1d"
 
 class StockResponse(BaseModel):
     stock: str
@@ -41,65 +51,50 @@ def auto_detect_risk(volatility: float) -> str:
     return "low"
 
 def save_user_history(row: dict):
-    os.makedirs("user_history", exist_ok=True)
-    file = os.path.join("user_history", "user_history.csv")
-
-    new_df = pd.DataFrame([row])
-
-    try:
-        if os.path.exists(file):
-            old_df = pd.read_csv(file)
-            final_df = pd.concat([old_df, new_df], ignore_index=True)
-        else:
-            final_df = new_df
-
-        final_df.to_csv(file, index=False)
-
-    except PermissionError:
-        # Windows Excel lock – skip saving silently
-        return
+    # Buffered and flushed by a background thread; never blocks the request
+    history_sink.record(row)
 
 
 # ---------------- SERVICES ----------------
 class StockService:
     @staticmethod
-    def fetch(symbol: str):
+    def fetch(symbol: str, interval: str = "1d"):
+        # Same per-interval download window and annualization as main.py
         t = yf.Ticker(symbol)
-        hist = t.history(period="1mo")
+        hist = t.history(period=markets.INTERVALS[interval][1], interval=interval)
 
         returns = hist["Close"].pct_change().dropna()
-        volatility = returns.std() * np.sqrt(252)
+        volatility = returns.std() * np.sqrt(markets.bars_per_year(symbol, interval))
 
         return hist, float(hist["Close"].iloc[-1]), volatility
 
 class Predictor:
     @staticmethod
-    def predict(hist):
-        df = hist.copy()
-        df["x"] = range(len(df))
-        model = LinearRegression()
-        model.fit(df[["x"]], df["Close"])
-        next_price = model.predict(pd.DataFrame([[len(df)]], columns=["x"]))[0]
-
-        confidence = model.score(df[["x"]], df["Close"]) * 100
+    def predict(hist, window: int = None):
+        close = hist["Close"].to_numpy(dtype=float)
+        if window:
+            close = close[-window:]
+        next_price, confidence, _ = analytics.trend_forecast(close)
         return float(next_price), float(confidence)
 
 def detect_intent(q):
-    q = q.lower()
-    if "trend" in q:
-        return "trend"
-    if "buy" in q:
-        return "buy"
-    if "sell" in q:
-        return "sell"
-    return "general"
+    return intent_engine.parse(q).intent
 
 # ---------------- API ----------------
+@app.on_event("shutdown")
+def shutdown():
+    execution.shutdown()
+    history_sink.close()
+
 @app.post("/chat", response_model=StockResponse)
 async def chat(q: StockQuery):
     try:
-        hist, current, vol = StockService.fetch(q.stock)
-        predicted, confidence = Predictor.predict(hist)
+        if q.interval not in markets.INTERVALS:
+            raise ValueError(f"Unsupported interval '{q.interval}', choose from {', '.join(markets.INTERVALS)}")
+        hist, current, vol = await execution.run_io(StockService.fetch, q.stock, q.interval, stage="fetch")
+        predicted, confidence = await execution.run_cpu(
+            Predictor.predict, hist, markets.INTERVALS[q.interval][2], stage="predict"
+        )
         risk = auto_detect_risk(vol)
         intent = detect_intent(q.question)
 
@@ -120,7 +115,8 @@ Intent: {intent.upper()}
             "predicted_price": predicted,
             "risk": risk,
             "intent": intent,
-            "confidence": confidence
+            "confidence": confidence,
+            "interval": q.interval
         })
 
         return {
@@ -0,0 +1,159 @@
+# backtest.py
+#
+#   python backtest.py                      # whole catalogue, 5y of daily bars
+#   python backtest.py AAPL TCS.NS --window 63 -o report.json
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import numpy as np
+
+MIN_TESTS = 20
+
+
+# ---------------- ROLLING FORECAST ----------------
+def rolling_trend_forecast(close: np.ndarray, window: int) -> np.ndarray:
+    # forecast[j] is the trend-line prediction for close[j + window] fitted
+    # on close[j : j + window] – the same fit as Predictor.predict, for every
+    # window at once via cumulative sums instead of one regression per step.
+    close = np.asarray(close, dtype=float)
+    n = close.size
+    if n <= window:
+        return np.empty(0)
+
+    # Centre prices so the cumulative sums stay well conditioned
+    y = close - close.mean()
+    idx = np.arange(n, dtype=float)
+    cy = np.concatenate(([0.0], np.cumsum(y)))
+    ciy = np.concatenate(([0.0], np.cumsum(idx * y)))
+
+    starts = np.arange(n - window, dtype=float)
+    s = starts.astype(int)
+    sum_y = cy[s + window] - cy[s]
+    # sum over the window of (position within window) * y
+    sum_xy = (ciy[s + window] - ciy[s]) - starts * sum_y
+
+    x_mean = (window - 1) / 2.0
+    sxx = window * (window * window - 1) / 12.0
+    slope = (sum_xy - x_mean * sum_y) / sxx
+    intercept = sum_y / window - slope * x_mean
+    return intercept + slope * window + close.mean()
+
+
+def score(close: np.ndarray, window: int) -> dict:
+    close = np.asarray(close, dtype=float)
+    close = close[~np.isnan(close)]
+    if close.size < window + MIN_TESTS:
+        raise ValueError(f"Need at least {window + MIN_TESTS} bars, got {close.size}")
+
+    forecast = rolling_trend_forecast(close, window)
+    actual = close[window:]
+    last = close[window - 1:-1]
+
+    def metrics(pred):
+        err = pred - actual
+        moved = actual != last
+        hits = np.sign(pred - last) == np.sign(actual - last)
+        return {
+            "mae": float(np.mean(np.abs(err))),
+            "mape": float(np.mean(np.abs(err) / np.abs(actual)) * 100),
+            "hit_rate": float(np.mean(hits[moved]) * 100) if moved.any() else None,
+        }
+
+    model = metrics(forecast)
+    naive = metrics(last)
+    # Naive "tomorrow = today" has no direction, so only its errors are comparable
+    naive["hit_rate"] = None
+    return {
+        "tests": int(actual.size),
+        "model": model,
+        "naive": naive,
+        "beats_naive": model["mae"] < naive["mae"],
+    }
+
+
+# ---------------- DATA ----------------
+def load_close(symbol: str, period: str = "5y") -> np.ndarray:
+    import yfinance as yf
+
+    from bar_store import bar_store
+    from upstream import upstream
+
+    t = yf.Ticker(symbol)
+    hist = bar_store.load(
+        symbol, period, "1d",
+        lambda **kw: upstream.call("history", t.history, auto_adjust=True, **kw),
+    )
+    if hist is None or hist.empty or "Close" not in hist.columns:
+        raise ValueError("No market data returned from Yahoo Finance")
+    return hist["Close"].to_numpy(dtype=float)
+
+
+def score_symbol(symbol: str, close: np.ndarray, window: int = 126) -> dict:
+    try:
+        result = score(close, window)
+        result["stock"] = symbol
+        return result
+    except Exception as e:
+        return {"stock": symbol, "error": str(e)}
+
+
+def run(symbols, period: str = "5y", window: int = 126, workers: int = None) -> dict:
+    # Bars are loaded (and topped up) by threads in this process, so every
+    # upstream request shares its one rate limiter; only the scoring fans
+    # out to one process per core, as each symbol's closes arrive.
+    workers = workers or os.cpu_count()
+    results, scoring = [], []
+    with ThreadPoolExecutor(max_workers=workers) as io, ProcessPoolExecutor(max_workers=workers) as pool:
+        loads = {io.submit(load_close, s, period): s for s in symbols}
+        for future in as_completed(loads):
+            symbol = loads[future]
+            try:
+                close = future.result()
+            except Exception as e:
+                results.append({"stock": symbol, "error": str(e)})
+                continue
+            scoring.append(pool.submit(score_symbol, symbol, close, window))
+        for future in as_completed(scoring):
+            results.append(future.result())
+    results.sort(key=lambda r: r["stock"])
+
+    scored = [r for r in results if "error" not in r]
+    summary = {
+        "symbols": len(results),
+        "scored": len(scored),
+        "failed": len(results) - len(scored),
+    }
+    if scored:
+        summary.update({
+            "beats_naive": sum(r["beats_naive"] for r in scored),
+            "median_model_mape": float(np.median([r["model"]["mape"] for r in scored])),
+            "median_naive_mape": float(np.median([r["naive"]["mape"] for r in scored])),
+            "median_hit_rate": float(np.nanmedian([
+                r["model"]["hit_rate"] if r["model"]["hit_rate"] is not None else np.nan for r in scored
+            ])),
+        })
+    return {"period": period, "window": window, "summary": summary, "results": results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of the linear-trend predictor")
+    parser.add_argument("symbols", nargs="*", help="defaults to the whole symbol catalogue")
+    parser.add_argument("--period", default="5y")
+    parser.add_argument("--window", type=int, default=126, help="bars per fit (126 ≈ 6 months)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("-o", "--output")
+    args = parser.parse_args()
+
+    symbols = args.symbols
+    if not symbols:
+        from catalogue import catalogue
+        symbols = catalogue.symbols()
+
+    report = run(symbols, args.period, args.window, args.workers)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    print(json.dumps(report["summary"], indent=2))
@@ -0,0 +1,150 @@
+# bar_store.py
+import importlib.util
+import os
+import re
+import threading
+from datetime import timedelta
+
+import numpy as np
+
+# Only check that pyarrow is installed; pandas imports it on first use.
+# Without pyarrow fall back to pickle – same layout, just not columnar
+_EXT = "parquet" if importlib.util.find_spec("pyarrow") is not None else "pkl"
+
+PERIOD_DAYS = {
+    "1d": 1, "5d": 5,
+    "1mo": 31, "3mo": 92, "6mo": 183,
+    "1y": 366, "2y": 731, "5y": 1827, "10y": 3653,
+}
+
+
+# ---------------- STORE ----------------
+class BarStore:
+    def __init__(self, root: str):
+        self.root = root
+        self._locks = {}
+        self._guard = threading.Lock()
+
+    def _lock(self, symbol: str, interval: str) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault((symbol, interval), threading.Lock())
+
+    def path(self, symbol: str, interval: str) -> str:
+        safe = re.sub(r"[^A-Za-z0-9._-]", "_", symbol.upper())
+        return os.path.join(self.root, interval, f"{safe}.{_EXT}")
+
+    def read(self, symbol: str, interval: str):
+        file = self.path(symbol, interval)
+        if not os.path.exists(file):
+            return None
+        import pandas as pd
+
+        try:
+            if _EXT == "parquet":
+                return pd.read_parquet(file)
+            return pd.read_pickle(file)
+        except Exception:
+            # Corrupt / half-written segment – treat as missing and refetch
+            return None
+
+    def write(self, symbol: str, interval: str, df: "pd.DataFrame"):
+        file = self.path(symbol, interval)
+        os.makedirs(os.path.dirname(file), exist_ok=True)
+        tmp = f"{file}.tmp"
+        if _EXT == "parquet":
+            df.to_parquet(tmp)
+        else:
+            df.to_pickle(tmp)
+        os.replace(tmp, file)
+
+    @staticmethod
+    def merge(old: "pd.DataFrame", new: "pd.DataFrame") -> "pd.DataFrame":
+        import pandas as pd
+
+        if old is None or old.empty:
+            return new
+        if new is None or new.empty:
+            return old
+        if old.index.tz is not None and new.index.tz is not None:
+            new = new.tz_convert(old.index.tz)
+        df = pd.concat([old, new])
+        # Newest download wins for the overlapping (possibly still forming) bar
+        df = df[~df.index.duplicated(keep="last")]
+        return df.sort_index()
+
+    @staticmethod
+    def rebased(stored: "pd.DataFrame", tail: "pd.DataFrame") -> bool:
+        # With auto_adjust, a split or dividend makes Yahoo rescale every
+        # earlier price, so the stored bars no longer share the tail's basis
+        if tail is None or tail.empty:
+            return False
+        if stored.index.tz is not None and tail.index.tz is not None:
+            tail = tail.tz_convert(stored.index.tz)
+        for action in ("Dividends", "Stock Splits"):
+            if action not in tail:
+                continue
+            known = stored[action].reindex(tail.index) if action in stored else None
+            new = tail[action].fillna(0)
+            if known is not None:
+                new = new[new != known.fillna(0)]
+            if (new != 0).any():
+                return True
+        # The last stored bar may have been fetched while still forming;
+        # any completed bar both downloads share must agree
+        overlap = stored.index.intersection(tail.index)
+        overlap = overlap[overlap < stored.index[-1]]
+        if overlap.empty:
+            return False
+        return not np.allclose(stored.loc[overlap, "Close"], tail.loc[overlap, "Close"], rtol=1e-4)
+
+    def load(self, symbol: str, period: str, interval: str, history):
+        # history(**kwargs) -> DataFrame, a thin wrapper around yf.Ticker.history
+        with self._lock(symbol, interval):
+            stored = self.read(symbol, interval)
+            days = PERIOD_DAYS.get(period)
+
+            covered = (
+                stored is not None
+                and not stored.empty
+                and days is not None
+                and stored.index[0] <= stored.index[-1] - timedelta(days=days - 5)
+            )
+
+            if covered:
+                # Only the tail is missing; re-request the last two stored
+                # bars too, so one completed bar overlaps to check the basis
+                start = stored.index[max(len(stored) - 2, 0)]
+                tail = history(start=start.strftime("%Y-%m-%d"), interval=interval)
+                if self.rebased(stored, tail):
+                    merged = history(period=period, interval=interval)
+                else:
+                    merged = self.merge(stored, tail)
+            else:
+                merged = self.merge(stored, history(period=period, interval=interval))
+
+            if merged is None or merged.empty:
+                return merged
+
+            if stored is None or not merged.equals(stored):
+                self.write(symbol, interval, merged)
+
+            return self.trim(merged, period)
+
+    def last_good(self, symbol: str, period: str, interval: str):
+        # Whatever was stored by the last successful download, for serving
+        # stale bars while upstream is failing
+        stored = self.read(symbol, interval)
+        if stored is None or stored.empty:
+            return None
+        return self.trim(stored, period)
+
+    @staticmethod
+    def trim(df: "pd.DataFrame", period: str) -> "pd.DataFrame":
+        days = PERIOD_DAYS.get(period)
+        if days is None:
+            return df
+        return df[df.index >= df.index[-1] - timedelta(days=days)]
+
+
+# ---------------- SHARED INSTANCES ----------------
+bar_store = BarStore(os.getenv("BAR_STORE_DIR", "bar_store"))
@@ -0,0 +1,111 @@
+# bars.py
+import numpy as np
+
+# pandas is imported inside the DataFrame edges only: it is most of the
+# app's import time, and the request path works on the arrays
+
+NS_PER_DAY = 86_400_000_000_000
+
+
+# ---------------- BAR SERIES ----------------
+class BarSeries:
+    # One symbol's bars as flat arrays: bar times as int64 ns since the
+    # epoch (UTC), close and volume as float64 (volumes pass 2**24, where
+    # float32 stops being exact), open/high/low as float32. About 40% less
+    # memory than the yfinance DataFrame, and every column is a contiguous
+    # array the analytics can use without copying.
+    __slots__ = ("ts", "open", "high", "low", "close", "volume", "tz", "stale")
+
+    def __init__(self, ts, open, high, low, close, volume, tz=None, stale=False):
+        self.ts = ts
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.tz = tz
+        self.stale = stale
+
+    def __len__(self):
+        return len(self.ts)
+
+    # ---------- DATAFRAME EDGES ----------
+    @classmethod
+    def from_frame(cls, df: "pd.DataFrame", stale: bool = False) -> "BarSeries":
+        index = df.index
+        tz = str(index.tz) if index.tz is not None else None
+        if tz is None:
+            index = index.tz_localize("UTC")
+
+        def column(name, dtype):
+            if name in df:
+                return df[name].to_numpy(dtype=dtype, copy=True)
+            if name == "Volume":
+                return np.full(len(df), np.nan, dtype=dtype)
+            # Close-only data: the bar's range collapses onto its close
+            return df["Close"].to_numpy(dtype=dtype, copy=True)
+
+        return cls(
+            np.array(index.as_unit("ns").asi8, dtype=np.int64),
+            column("Open", np.float32),
+            column("High", np.float32),
+            column("Low", np.float32),
+            column("Close", np.float64),
+            column("Volume", np.float64),
+            tz, stale,
+        )
+
+    def to_frame(self) -> "pd.DataFrame":
+        import pandas as pd
+
+        return pd.DataFrame({
+            "Open": self.open, "High": self.high, "Low": self.low,
+            "Close": self.close, "Volume": self.volume,
+        }, index=self.index)
+
+    @property
+    def index(self) -> "pd.DatetimeIndex":
+        import pandas as pd
+
+        index = pd.to_datetime(self.ts, utc=True)
+        return index.tz_convert(self.tz) if self.tz else index
+
+    # ---------- ACCESSORS ----------
+    def last_time(self) -> "pd.Timestamp":
+        import pandas as pd
+
+        last = pd.Timestamp(int(self.ts[-1]), tz="UTC")
+        return last.tz_convert(self.tz) if self.tz else last
+
+    def days(self) -> np.ndarray:
+        # Calendar day of each bar in the exchange's own time zone
+        index = self.index
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        return index.as_unit("ns").asi8 // NS_PER_DAY
+
+    def nbytes(self) -> int:
+        return sum(getattr(self, a).nbytes for a in ("ts", "open", "high", "low", "close", "volume"))
+
+
+def close_matrix(series) -> np.ndarray:
+    # (bars x symbols) closes, each column bottom-aligned on its latest bar
+    # and NaN-padded above, the layout analytics.right_align produces.
+    rows = max((len(s) for s in series), default=0)
+    matrix = np.full((rows, len(series)), np.nan)
+    for i, s in enumerate(series):
+        matrix[rows - len(s):, i] = s.close
+    return matrix
+
+
+def aligned_returns(series) -> np.ndarray:
+    # Daily simple returns on the calendar days every series traded, for
+    # markets in different time zones alike; a day's last bar is its close.
+    days = [s.days() for s in series]
+    common = days[0]
+    for d in days[1:]:
+        common = np.intersect1d(common, d)
+    closes = np.column_stack([
+        s.close[np.searchsorted(d, common, side="right") - 1] for s, d in zip(series, days)
+    ])
+    return closes[1:] / closes[:-1] - 1.0
@@ -0,0 +1,257 @@
+# bench.py
+#
+#   python benchmarks/bench.py micro                 # per-function timings
+#   python benchmarks/bench.py load --levels 1 8 32  # end-to-end /chat load
+#   python benchmarks/bench.py all -o run.json
+#   python benchmarks/bench.py compare old.json new.json
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Keep benchmark state out of the working tree
+WORKDIR = tempfile.mkdtemp(prefix="stock-bench-")
+os.environ.setdefault("BAR_STORE_DIR", os.path.join(WORKDIR, "bars"))
+os.environ.setdefault("HISTORY_DIR", os.path.join(WORKDIR, "history"))
+os.environ.setdefault("CPU_POOL", "thread")
+# Measure our code, not the upstream rate limiter
+os.environ.setdefault("UPSTREAM_RATE", "1000000")
+os.environ.setdefault("UPSTREAM_BURST", "1000000")
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import synthetic  # noqa: E402
+
+SYMBOLS = ["RELIANCE.NS", "TCS.NS", "AAPL", "MSFT", "0700.HK", "ASML.AS", "BMW.DE", "CBA.AX"]
+QUESTIONS = [
+    "What is the current trend?",
+    "Should I buy this stock?",
+    "Is this a good time to sell?",
+    "Tell me about the company",
+]
+ROW = {
+    "timestamp": "2026-01-01T10:00:00", "stock": "AAPL", "question": "Should I buy?",
+    "current_price": 101.5, "predicted_price": 102.0, "risk": "low",
+    "intent": "buy", "confidence": 55.0,
+}
+
+
+# ---------------- HELPERS ----------------
+def summarize(samples) -> dict:
+    a = np.asarray(samples, dtype=float) * 1e6  # microseconds
+    return {
+        "n": int(a.size),
+        "mean_us": round(float(a.mean()), 3),
+        "p50_us": round(float(np.percentile(a, 50)), 3),
+        "p95_us": round(float(np.percentile(a, 95)), 3),
+        "p99_us": round(float(np.percentile(a, 99)), 3),
+        "min_us": round(float(a.min()), 3),
+    }
+
+
+def timeit(fn, n: int, setup=None) -> dict:
+    samples = []
+    for i in range(n):
+        if setup is not None:
+            setup(i)
+        t0 = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - t0)
+    return summarize(samples)
+
+
+def load_backend_module():
+    spec = importlib.util.spec_from_file_location("backend_main", os.path.join(ROOT, "backend", "main.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def legacy_save_user_history(path: str, row: dict):
+    # The original read-concat-rewrite writer, kept as a baseline
+    new_df = pd.DataFrame([row])
+    if os.path.exists(path):
+        final_df = pd.concat([pd.read_csv(path), new_df], ignore_index=True)
+    else:
+        final_df = new_df
+    final_df.to_csv(path, index=False)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+# ---------------- MICRO ----------------
+def run_micro(n: int) -> dict:
+    import main
+
+    hist = synthetic.ohlcv("AAPL", 126)
+    bars = main.BarSeries.from_frame(hist)
+    results = {}
+
+    def cold_setup(i):
+        main.bar_cache.invalidate()
+        shutil.rmtree(os.environ["BAR_STORE_DIR"], ignore_errors=True)
+
+    results["StockService.fetch[cold]"] = timeit(
+        lambda i: main.StockService.fetch(SYMBOLS[i % len(SYMBOLS)]), max(n // 10, 5), cold_setup
+    )
+    results["StockService.fetch[store]"] = timeit(
+        lambda i: main.StockService.fetch(SYMBOLS[i % len(SYMBOLS)]), max(n // 10, 5),
+        lambda i: main.bar_cache.invalidate(),
+    )
+    results["StockService.fetch[cached]"] = timeit(
+        lambda i: main.StockService.fetch(SYMBOLS[i % len(SYMBOLS)]), n
+    )
+    results["Predictor.predict"] = timeit(lambda i: main.Predictor.predict(bars), n)
+    results["BarSeries.from_frame"] = timeit(lambda i: main.BarSeries.from_frame(hist), n)
+    results["auto_detect_risk"] = timeit(lambda i: main.auto_detect_risk((i % 60) / 100), n)
+    results["detect_intent"] = timeit(lambda i: main.detect_intent(QUESTIONS[i % len(QUESTIONS)]), n)
+
+    results["save_user_history[main]"] = timeit(lambda i: main.save_user_history(ROW), n)
+    backend = load_backend_module()
+    results["save_user_history[backend]"] = timeit(lambda i: backend.save_user_history(ROW), n)
+
+    legacy = os.path.join(WORKDIR, "legacy_history.csv")
+    results["save_user_history[legacy-rewrite]"] = timeit(
+        lambda i: legacy_save_user_history(legacy, ROW), max(n // 10, 5)
+    )
+    main.history_sink.flush()
+    return results
+
+
+# ---------------- LOAD ----------------
+async def _load_level(app, concurrency: int, requests_per_level: int) -> dict:
+    import httpx
+
+    latencies, errors = [], 0
+    queue = asyncio.Queue()
+    for i in range(requests_per_level):
+        queue.put_nowait(i)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            nonlocal errors
+            while True:
+                try:
+                    i = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                payload = {"stock": SYMBOLS[i % len(SYMBOLS)], "question": QUESTIONS[i % len(QUESTIONS)]}
+                t0 = time.perf_counter()
+                r = await client.post("/chat", json=payload)
+                latencies.append(time.perf_counter() - t0)
+                if r.status_code != 200 or r.json().get("intent_detected") == "error":
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    out = summarize(latencies)
+    out.update({
+        "concurrency": concurrency,
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "errors": errors,
+    })
+    return out
+
+
+def run_load(levels, requests_per_level: int) -> list:
+    import main
+
+    async def run():
+        results = []
+        for level in levels:
+            main.bar_cache.invalidate()
+            results.append(await _load_level(main.app, level, requests_per_level))
+        return results
+
+    return asyncio.run(run())
+
+
+# ---------------- COMPARE ----------------
+def compare(old_path: str, new_path: str):
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+
+    print(f"{'benchmark':40} {'old p50 us':>12} {'new p50 us':>12} {'change':>8}")
+    for name, stats in new.get("micro", {}).items():
+        before = old.get("micro", {}).get(name)
+        if before:
+            change = (stats["p50_us"] / before["p50_us"] - 1) * 100 if before["p50_us"] else 0.0
+            print(f"{name:40} {before['p50_us']:12.1f} {stats['p50_us']:12.1f} {change:+7.1f}%")
+
+    old_load = {r["concurrency"]: r for r in old.get("load", [])}
+    for r in new.get("load", []):
+        before = old_load.get(r["concurrency"])
+        if before:
+            print(f"load c={r['concurrency']:<4} rps {before['throughput_rps']:>9} -> {r['throughput_rps']:<9}"
+                  f" p99 {before['p99_us'] / 1000:.1f}ms -> {r['p99_us'] / 1000:.1f}ms")
+
+
+# ---------------- CLI ----------------
+def main_cli():
+    parser = argparse.ArgumentParser(description="Benchmark the fetch-predict-respond pipeline")
+    parser.add_argument("mode", choices=["micro", "load", "all", "compare"])
+    parser.add_argument("files", nargs="*", help="two result files for compare")
+    parser.add_argument("-n", type=int, default=500, help="iterations per micro benchmark")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--requests", type=int, default=400, help="requests per concurrency level")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated upstream latency (s)")
+    parser.add_argument("-o", "--output", help="write results JSON here")
+    args = parser.parse_args()
+
+    if args.mode == "compare":
+        if len(args.files) != 2:
+            parser.error("compare needs two result files")
+        compare(*args.files)
+        return
+
+    synthetic.install(latency=args.latency)
+    result = {
+        "commit": git_commit(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {"n": args.n, "levels": args.levels, "requests": args.requests, "latency": args.latency},
+    }
+    try:
+        if args.mode in ("micro", "all"):
+            result["micro"] = run_micro(args.n)
+        if args.mode in ("load", "all"):
+            result["load"] = run_load(args.levels, args.requests)
+    finally:
+        # Flush the history sink while its directory still exists; its own
+        # atexit close would only run after the rmtree
+        if "main" in sys.modules:
+            sys.modules["main"].history_sink.close()
+        shutil.rmtree(WORKDIR, ignore_errors=True)
+
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,54 @@
+# synthetic.py
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+PERIOD_BARS = {"1d": 1, "5d": 5, "1mo": 21, "3mo": 63, "6mo": 126, "1y": 252, "2y": 504, "5y": 1260}
+
+
+def ohlcv(symbol: str, bars: int = 126, end=None, freq: str = "B") -> pd.DataFrame:
+    # Deterministic per symbol: the same symbol always yields the same walk
+    rng = np.random.default_rng(zlib.crc32(symbol.encode()))
+    index = pd.date_range(end=end or pd.Timestamp.now().normalize(), periods=bars, freq=freq, tz="UTC")
+
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, bars)))
+    spread = np.abs(rng.normal(0, 0.01, bars)) * close
+    open_ = close * (1 + rng.normal(0, 0.003, bars))
+    return pd.DataFrame({
+        "Open": open_,
+        "High": np.maximum(open_, close) + spread,
+        "Low": np.minimum(open_, close) - spread,
+        "Close": close,
+        "Volume": rng.integers(100_000, 5_000_000, bars),
+        "Dividends": 0.0,
+        "Stock Splits": 0.0,
+    }, index=index)
+
+
+def install(latency: float = 0.0):
+    # Replace the yfinance entry points used by the backend with the
+    # generator; latency (seconds) simulates the upstream round trip.
+    import yfinance as yf
+
+    class Ticker:
+        def __init__(self, symbol):
+            self.symbol = symbol
+
+        def history(self, period="6mo", interval="1d", start=None, **kwargs):
+            time.sleep(latency)
+            bars = PERIOD_BARS.get(period, 126)
+            if start is not None:
+                bars = max(1, len(pd.bdate_range(start, pd.Timestamp.now().normalize())))
+            return ohlcv(self.symbol, bars)
+
+    def download(tickers, period="6mo", interval="1d", **kwargs):
+        time.sleep(latency)
+        if isinstance(tickers, str):
+            tickers = tickers.split()
+        bars = PERIOD_BARS.get(period, 126)
+        return pd.concat({t: ohlcv(t, bars) for t in tickers}, axis=1)
+
+    yf.Ticker = Ticker
+    yf.download = download
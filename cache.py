@@ -0,0 +1,157 @@
+# cache.py
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+# ---------------- SINGLE-FLIGHT ----------------
+class _Call:
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+# ---------------- TTL / LRU CACHE ----------------
+class TTLCache:
+    def __init__(self, ttl: float = 300.0, maxsize: int = 256):
+        self.ttl = float(ttl)
+        self.maxsize = int(maxsize)
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._inflight = {}         # key -> _Call
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.coalesced = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._lookup(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def _lookup(self, key):
+        # Caller must hold self._lock
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def values(self) -> list:
+        # Snapshot of what is cached, expired entries included
+        with self._lock:
+            return [value for _, value in self._data.values()]
+
+    def set(self, key, value, ttl: float = None):
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def _store(self, key, value, ttl=None):
+        # Caller must hold self._lock
+        ttl = self.ttl if ttl is None else ttl
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def get_or_load(self, key, loader, ttl=None):
+        # ttl may be a function of the loaded value, applied once on store
+        with self._lock:
+            value = self._lookup(key)
+            if value is not None:
+                self.hits += 1
+                return value
+
+            call = self._inflight.get(key)
+            if call is not None:
+                # Someone else is already loading this key – wait for them
+                self.coalesced += 1
+                leader = False
+            else:
+                self.misses += 1
+                call = _Call()
+                self._inflight[key] = call
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = loader()
+            with self._lock:
+                self._store(key, call.value, ttl(call.value) if callable(ttl) else ttl)
+            return call.value
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            call.event.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "inflight": len(self._inflight),
+                "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            }
+
+
+# ---------------- SHARED INSTANCES ----------------
+bar_cache = TTLCache(
+    ttl=float(os.getenv("BAR_CACHE_TTL", "300")),
+    maxsize=int(os.getenv("BAR_CACHE_SIZE", "512")),
+)
+
+# (symbol, period, interval, last bar time, last close) -> (price, confidence)
+forecast_cache = TTLCache(
+    ttl=float(os.getenv("FORECAST_CACHE_TTL", str(24 * 3600))),
+    maxsize=int(os.getenv("FORECAST_CACHE_SIZE", "1024")),
+)
+
+# (symbols, period, last bar times) -> (symbols, aligned daily returns matrix)
+returns_cache = TTLCache(
+    ttl=float(os.getenv("RETURNS_CACHE_TTL", str(24 * 3600))),
+    maxsize=int(os.getenv("RETURNS_CACHE_SIZE", "128")),
+)
+
+# (symbol, last bar time, last close, model, model version, indicators) -> /chat analytics
+analysis_cache = TTLCache(
+    ttl=float(os.getenv("ANALYSIS_CACHE_TTL", str(24 * 3600))),
+    maxsize=int(os.getenv("ANALYSIS_CACHE_SIZE", "2048")),
+)
@@ -0,0 +1,94 @@
+# catalogue.py
+import difflib
+import hashlib
+import json
+import os
+from bisect import bisect_left
+
+CATALOGUE_FILE = os.getenv(
+    "SYMBOL_CATALOGUE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "symbols.json")
+)
+
+
+# ---------------- CATALOGUE ----------------
+class Catalogue:
+    def __init__(self, path: str = CATALOGUE_FILE):
+        with open(path, "rb") as f:
+            raw = f.read()
+        doc = json.loads(raw)
+
+        self.version = doc.get("version", 1)
+        self.etag = f'"{self.version}-{hashlib.sha256(raw).hexdigest()[:16]}"'
+
+        # Later duplicates never override the first entry
+        self.entries = []
+        self.by_symbol = {}
+        for item in doc["symbols"]:
+            key = item["symbol"].upper()
+            if key not in self.by_symbol:
+                self.by_symbol[key] = item
+                self.entries.append(item)
+
+        # Sorted (term, position) pairs over symbols and every name word,
+        # so a prefix lookup is two bisects instead of a scan.
+        terms = []
+        for pos, item in enumerate(self.entries):
+            terms.append((item["symbol"].lower(), pos))
+            for word in item["name"].lower().replace(".", " ").split():
+                terms.append((word, pos))
+        terms.sort()
+        self._terms = [t for t, _ in terms]
+        self._positions = [p for _, p in terms]
+        self._vocab = sorted(set(self._terms))
+
+    def symbols(self) -> list:
+        return [item["symbol"] for item in self.entries]
+
+    def get(self, symbol: str):
+        return self.by_symbol.get(symbol.upper())
+
+    def search(self, query: str = "", limit: int = 20, sector: str = None, exchange: str = None) -> list:
+        def wanted(item):
+            return (sector is None or item["sector"].lower() == sector.lower()) and \
+                   (exchange is None or item["exchange"].lower() == exchange.lower())
+
+        query = (query or "").strip().lower()
+        if not query:
+            return [item for item in self.entries if wanted(item)][:limit]
+
+        positions = self._prefix(query)
+        if not positions:
+            # Typo tolerance: match the closest known terms instead
+            for term in difflib.get_close_matches(query, self._vocab, n=10, cutoff=0.75):
+                positions.extend(self._prefix(term, exact=True))
+
+        # Exact symbol first, then symbol prefixes, then name matches
+        ranked = sorted(
+            dict.fromkeys(positions),
+            key=lambda p: (
+                self.entries[p]["symbol"].lower() != query,
+                not self.entries[p]["symbol"].lower().startswith(query),
+                p,
+            ),
+        )
+        results = []
+        for pos in ranked:
+            item = self.entries[pos]
+            if wanted(item):
+                results.append(item)
+                if len(results) >= limit:
+                    break
+        return results
+
+    def _prefix(self, prefix: str, exact: bool = False) -> list:
+        lo = bisect_left(self._terms, prefix)
+        out = []
+        for i in range(lo, len(self._terms)):
+            term = self._terms[i]
+            if term != prefix if exact else not term.startswith(prefix):
+                break
+            out.append(self._positions[i])
+        return out
+
+
+catalogue = Catalogue()
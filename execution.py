@@ -0,0 +1,87 @@
+# execution.py
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+import metrics
+
+# ---------------- CONFIG ----------------
+IO_WORKERS = int(os.getenv("IO_WORKERS", "16"))
+CPU_WORKERS = int(os.getenv("CPU_WORKERS", str(os.cpu_count() or 1)))
+# "process" runs model work in a process pool, "thread" keeps it in-process
+CPU_POOL = os.getenv("CPU_POOL", "process")
+
+FETCH_TIMEOUT = float(os.getenv("FETCH_TIMEOUT", "20"))
+PREDICT_TIMEOUT = float(os.getenv("PREDICT_TIMEOUT", "10"))
+
+
+class StageTimeout(Exception):
+    pass
+
+
+# ---------------- POOLS ----------------
+_io_pool = None
+_cpu_pool = None
+
+# Limits in-flight work so a burst queues here instead of inside the pools
+_io_slots = asyncio.Semaphore(IO_WORKERS)
+_cpu_slots = asyncio.Semaphore(max(CPU_WORKERS, 1))
+
+
+def io_pool() -> ThreadPoolExecutor:
+    global _io_pool
+    if _io_pool is None:
+        _io_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="io")
+    return _io_pool
+
+
+def cpu_pool():
+    global _cpu_pool
+    if _cpu_pool is None:
+        if CPU_POOL == "process" and CPU_WORKERS > 0:
+            _cpu_pool = ProcessPoolExecutor(max_workers=CPU_WORKERS)
+        else:
+            _cpu_pool = ThreadPoolExecutor(max_workers=max(CPU_WORKERS, 1), thread_name_prefix="cpu")
+    return _cpu_pool
+
+
+def shutdown():
+    global _io_pool, _cpu_pool
+    if _io_pool is not None:
+        _io_pool.shutdown(wait=False, cancel_futures=True)
+        _io_pool = None
+    if _cpu_pool is not None:
+        _cpu_pool.shutdown(wait=False, cancel_futures=True)
+        _cpu_pool = None
+
+
+# ---------------- RUNNERS ----------------
+async def _run(pool, slots, stage, timeout, fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    t0 = time.perf_counter()
+    async with slots:
+        future = loop.run_in_executor(pool, partial(fn, *args, **kwargs))
+        try:
+            result = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            error = StageTimeout(f"{stage} timed out after {timeout:.0f}s")
+            metrics.record_stage(stage, time.perf_counter() - t0, error)
+            raise error
+        except Exception as e:
+            metrics.record_stage(stage, time.perf_counter() - t0, e)
+            raise
+    # Includes time spent queued for a slot, which is what the caller sees
+    metrics.record_stage(stage, time.perf_counter() - t0)
+    return result
+
+
+async def run_io(fn, *args, stage="io", timeout=FETCH_TIMEOUT, **kwargs):
+    # Blocking network / disk calls (yfinance, history writes)
+    return await _run(io_pool(), _io_slots, stage, timeout, fn, *args, **kwargs)
+
+
+async def run_cpu(fn, *args, stage="model", timeout=PREDICT_TIMEOUT, **kwargs):
+    # CPU-heavy model work; fn and its arguments must be picklable
+    return await _run(cpu_pool(), _cpu_slots, stage, timeout, fn, *args, **kwargs)
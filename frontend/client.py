@@ -0,0 +1,132 @@
+# client.py
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+API_BASE = os.getenv("API_BASE", "https://stock-analysiser.onrender.com")
+
+
+class ApiClient:
+    def __init__(
+        self,
+        base_url: str = API_BASE,
+        timeout: float = 30.0,
+        cache_ttl: float = 60.0,
+        pool_size: int = 16,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.pool_size = pool_size
+
+        # One keep-alive connection pool for every rerun and watchlist thread
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=[502, 503, 504],
+                              allowed_methods=None),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._cache = {}
+        self._lock = threading.Lock()
+
+        # (stock, question) -> (etag, payload) for revalidating expired answers
+        self._answers = {}
+
+        # params -> (etag, payload, last validated)
+        self._symbols = {}
+        self.symbols_revalidate = 600.0
+
+    # ---------- CACHE ----------
+    def _cached(self, key):
+        with self._lock:
+            item = self._cache.get(key)
+            if item and item[0] > time.monotonic():
+                return item[1]
+            self._cache.pop(key, None)
+            return None
+
+    def _remember(self, key, data):
+        with self._lock:
+            self._cache[key] = (time.monotonic() + self.cache_ttl, data)
+            if len(self._cache) > 1000:
+                now = time.monotonic()
+                self._cache = {k: v for k, v in self._cache.items() if v[0] > now}
+
+    # ---------- API ----------
+    def ask(self, stock: str, question: str, interval: str = "1d") -> dict:
+        key = (stock, question.strip().lower(), interval)
+        data = self._cached(key)
+        if data is not None:
+            return data
+
+        with self._lock:
+            etag, previous = self._answers.get(key, (None, None))
+        r = self.session.post(
+            f"{self.base_url}/chat",
+            json={"stock": stock, "question": question, "interval": interval},
+            headers={"If-None-Match": etag} if etag else {},
+            timeout=self.timeout,
+        )
+        if r.status_code == 304 and previous is not None:
+            # No new bar since our copy; the backend skipped the body
+            data = previous
+        else:
+            r.raise_for_status()
+            data = r.json()
+
+        # Backend errors come back as 200s; don't pin them in the cache
+        if data.get("intent_detected") != "error":
+            self._remember(key, data)
+            if r.headers.get("ETag"):
+                with self._lock:
+                    self._answers[key] = (r.headers["ETag"], data)
+                    if len(self._answers) > 1000:
+                        self._answers.pop(next(iter(self._answers)))
+        return data
+
+    def ask_many(self, stocks, question: str = "What is the current trend?") -> dict:
+        def one(stock):
+            try:
+                return stock, self.ask(stock, question)
+            except Exception as e:
+                return stock, {"stock": stock, "error": str(e)}
+
+        stocks = list(dict.fromkeys(stocks))
+        if not stocks:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.pool_size, len(stocks))) as pool:
+            return dict(pool.map(one, stocks))
+
+    def symbols(self, q: str = "", limit: int = 5000, sector: str = None) -> list:
+        # Conditional GET against the backend catalogue; within the
+        # revalidation window no request is made at all.
+        params = {"q": q, "limit": limit}
+        if sector:
+            params["sector"] = sector
+        key = tuple(sorted(params.items()))
+
+        with self._lock:
+            etag, payload, checked = self._symbols.get(key, (None, None, 0.0))
+        if payload is not None and time.monotonic() - checked < self.symbols_revalidate:
+            return payload
+
+        headers = {"If-None-Match": etag} if etag else {}
+        r = self.session.get(
+            f"{self.base_url}/symbols", params=params, headers=headers, timeout=self.timeout
+        )
+        if r.status_code != 304:
+            r.raise_for_status()
+            etag, payload = r.headers.get("ETag"), r.json()["symbols"]
+
+        with self._lock:
+            self._symbols[key] = (etag, payload, time.monotonic())
+        return payload
@@ -0,0 +1,188 @@
+# history.py
+import atexit
+import csv
+import os
+import threading
+import time
+from collections import deque
+
+from history_db import HistoryDB
+
+FIELDS = [
+    "timestamp", "stock", "question", "current_price",
+    "predicted_price", "risk", "intent", "confidence", "interval",
+]
+
+
+# ---------------- SINK ----------------
+class HistorySink:
+    def __init__(
+        self,
+        directory: str,
+        filename: str = "user_history.csv",
+        flush_size: int = 100,
+        flush_interval: float = 2.0,
+        max_bytes: int = 50 * 1024 * 1024,
+        backups: int = 5,
+        max_buffer: int = 100_000,
+        segments: bool = False,
+        db: HistoryDB = None,
+    ):
+        self.directory = directory
+        self.path = os.path.join(directory, filename)
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.segments = segments
+        self.db = db
+
+        self._buffer = deque(maxlen=max_buffer)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._header_checked = False
+
+        self.written = 0
+        self.dropped = 0
+        self.failures = 0
+
+    # ---------- REQUEST PATH ----------
+    def record(self, row: dict):
+        # O(1), never touches the disk
+        with self._lock:
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped += 1
+            self._buffer.append(row)
+            pending = len(self._buffer)
+        self._ensure_started()
+        if pending >= self.flush_size:
+            self._wake.set()
+
+    # ---------- BACKGROUND ----------
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="history-sink", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        with self._flush_lock:
+            self._flush()
+
+    def _flush(self):
+        with self._lock:
+            rows = list(self._buffer)
+            self._buffer.clear()
+        if not rows:
+            return
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self._rotate()
+            self._append_csv(rows)
+            if self.segments:
+                self._write_segment(rows)
+            self.written += len(rows)
+
+        except PermissionError:
+            # Windows Excel lock – put the rows back and retry next tick
+            self.failures += 1
+            with self._lock:
+                self._buffer.extendleft(reversed(rows))
+            return
+
+        except Exception as e:
+            self.failures += 1
+            print(f"History flush failed: {str(e)}")
+
+        if self.db is not None:
+            try:
+                self.db.insert_many(rows)
+            except Exception as e:
+                self.failures += 1
+                print(f"History index write failed: {str(e)}")
+
+    def _append_csv(self, rows):
+        new_file = not os.path.exists(self.path)
+        with open(self.path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS, extrasaction="ignore")
+            if new_file:
+                writer.writeheader()
+            writer.writerows(rows)
+
+    def _header_current(self) -> bool:
+        # A file written with older FIELDS is rotated out, not appended to
+        if not self._header_checked:
+            with open(self.path, newline="", encoding="utf-8") as f:
+                if next(csv.reader(f), None) != FIELDS:
+                    return False
+            self._header_checked = True
+        return True
+
+    def _rotate(self):
+        if not os.path.exists(self.path):
+            return
+        if os.path.getsize(self.path) < self.max_bytes and self._header_current():
+            return
+        base, ext = os.path.splitext(self.path)
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{base}.{i}{ext}"
+            if os.path.exists(src):
+                os.replace(src, f"{base}.{i + 1}{ext}")
+        os.replace(self.path, f"{base}.1{ext}")
+
+    def _write_segment(self, rows):
+        import pandas as pd
+
+        seg_dir = os.path.join(self.directory, "segments")
+        os.makedirs(seg_dir, exist_ok=True)
+        name = f"history-{time.time_ns()}.parquet"
+        pd.DataFrame(rows, columns=FIELDS).to_parquet(os.path.join(seg_dir, name), index=False)
+
+    def close(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.flush()
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending = len(self._buffer)
+        return {
+            "pending": pending,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failures": self.failures,
+        }
+
+
+# ---------------- SHARED INSTANCES ----------------
+HISTORY_DIR = os.getenv("HISTORY_DIR", "user_history")
+
+history_db = None
+if os.getenv("HISTORY_SQLITE", "1") == "1":
+    history_db = HistoryDB(os.getenv("HISTORY_DB", os.path.join(HISTORY_DIR, "history.db")))
+
+history_sink = HistorySink(
+    HISTORY_DIR,
+    flush_size=int(os.getenv("HISTORY_FLUSH_SIZE", "100")),
+    flush_interval=float(os.getenv("HISTORY_FLUSH_INTERVAL", "2")),
+    max_bytes=int(os.getenv("HISTORY_MAX_BYTES", str(50 * 1024 * 1024))),
+    segments=os.getenv("HISTORY_SEGMENTS", "0") == "1",
+    db=history_db,
+)
+atexit.register(history_sink.close)
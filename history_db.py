@@ -0,0 +1,185 @@
+# history_db.py
+import os
+import sqlite3
+import threading
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp       TEXT NOT NULL,
+    day             TEXT NOT NULL,
+    stock           TEXT NOT NULL,
+    question        TEXT,
+    current_price   REAL,
+    predicted_price REAL,
+    risk            TEXT,
+    intent          TEXT,
+    confidence      REAL,
+    realized_price  REAL,
+    interval        TEXT NOT NULL DEFAULT '1d'
+);
+CREATE INDEX IF NOT EXISTS ix_history_stock_ts ON history (stock, timestamp);
+CREATE INDEX IF NOT EXISTS ix_history_ts ON history (timestamp);
+"""
+
+# Columns added after the first release: (column, definition)
+MIGRATIONS = [
+    ("interval", "TEXT NOT NULL DEFAULT '1d'"),
+]
+
+INDEXES = """
+DROP INDEX IF EXISTS ix_history_unrealized;
+DROP INDEX IF EXISTS ix_history_open;
+CREATE INDEX IF NOT EXISTS ix_history_stock_day ON history (stock, interval, day);
+"""
+
+
+# ---------------- STORE ----------------
+class HistoryDB:
+    def __init__(self, path: str):
+        self.path = path
+        self._write_lock = threading.Lock()
+        self._local = threading.local()
+        self._ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        if not self._ready:
+            with self._write_lock:
+                conn.executescript(SCHEMA)
+                columns = {r["name"] for r in conn.execute("PRAGMA table_info(history)")}
+                for column, definition in MIGRATIONS:
+                    if column not in columns:
+                        conn.execute(f"ALTER TABLE history ADD COLUMN {column} {definition}")
+                conn.executescript(INDEXES)
+                self._ready = True
+        return conn
+
+    # ---------- WRITES ----------
+    def insert_many(self, rows):
+        conn = self._connect()
+        values = [
+            (
+                r.get("timestamp"), r.get("day") or str(r.get("timestamp", ""))[:10], r.get("stock"),
+                r.get("question"), r.get("current_price"), r.get("predicted_price"),
+                r.get("risk"), r.get("intent"), r.get("confidence"), r.get("interval") or "1d",
+            )
+            for r in rows
+        ]
+
+        # A daily forecast made from the bar of exchange date `day` is
+        # realized by the close of the bar after it. Rows carry the latest
+        # finished bars as (day, close) pairs; the newest row per stock wins.
+        # Intraday forecasts are for the next 1m-15m bar, which a daily
+        # close says nothing about.
+        closes = {}
+        for r in rows:
+            if r.get("closes"):
+                closes[r.get("stock")] = r["closes"]
+        realized = [
+            (close, stock, day)
+            for stock, bars in closes.items()
+            for (day, _), (_, close) in zip(bars, bars[1:])
+        ]
+
+        with self._write_lock, conn:
+            conn.executemany(
+                "INSERT INTO history (timestamp, day, stock, question, current_price, "
+                "predicted_price, risk, intent, confidence, interval) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                values,
+            )
+            conn.executemany(
+                "UPDATE history SET realized_price = ? "
+                "WHERE stock = ? AND interval = '1d' AND realized_price IS NULL AND day = ?",
+                realized,
+            )
+
+    # ---------- READS ----------
+    @staticmethod
+    def parse_cursor(cursor: str):
+        # Keyset pagination: cursor is "<timestamp>|<id>" of the last row
+        ts, sep, last_id = cursor.rpartition("|")
+        if not sep or not ts or not last_id.isdigit():
+            raise ValueError(f"Malformed cursor '{cursor}'")
+        return ts, int(last_id)
+
+    def query(self, stock=None, since=None, until=None, limit=100, cursor=None):
+        where, params = [], []
+        if stock:
+            where.append("stock = ?")
+            params.append(stock)
+        if since:
+            where.append("timestamp >= ?")
+            params.append(since)
+        if until:
+            where.append("timestamp < ?")
+            params.append(until)
+        if cursor:
+            ts, last_id = self.parse_cursor(cursor)
+            where.append("(timestamp < ? OR (timestamp = ? AND id < ?))")
+            params += [ts, ts, last_id]
+
+        sql = "SELECT * FROM history"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY timestamp DESC, id DESC LIMIT ?"
+        params.append(limit + 1)
+
+        rows = [dict(r) for r in self._connect().execute(sql, params)]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = f"{rows[-1]['timestamp']}|{rows[-1]['id']}"
+        return rows, next_cursor
+
+    def top_stocks(self, limit: int = 10, since=None) -> list:
+        # Most-requested symbols, e.g. to warm them up on boot
+        sql = "SELECT stock, COUNT(*) AS requests FROM history"
+        params = []
+        if since:
+            sql += " WHERE timestamp >= ?"
+            params.append(since)
+        sql += " GROUP BY stock ORDER BY requests DESC LIMIT ?"
+        params.append(limit)
+        return [r["stock"] for r in self._connect().execute(sql, params)]
+
+    def aggregates(self, stock=None, since=None, until=None):
+        where, params = [], []
+        if stock:
+            where.append("stock = ?")
+            params.append(stock)
+        if since:
+            where.append("timestamp >= ?")
+            params.append(since)
+        if until:
+            where.append("timestamp < ?")
+            params.append(until)
+
+        sql = """
+            SELECT
+                stock,
+                interval,
+                COUNT(*) AS requests,
+                MIN(timestamp) AS first_seen,
+                MAX(timestamp) AS last_seen,
+                AVG(confidence) AS avg_confidence,
+                COUNT(realized_price) AS realized,
+                AVG(ABS(predicted_price - realized_price)) AS mae,
+                AVG(ABS(predicted_price - realized_price) / realized_price) * 100 AS mape,
+                AVG(CASE WHEN realized_price IS NULL THEN NULL
+                         WHEN (predicted_price - current_price) * (realized_price - current_price) > 0
+                         THEN 1.0 ELSE 0.0 END) * 100 AS hit_rate
+            FROM history
+        """
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " GROUP BY stock, interval ORDER BY requests DESC"
+        return [dict(r) for r in self._connect().execute(sql, params)]
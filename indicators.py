@@ -0,0 +1,282 @@
+# indicators.py
+import math
+import threading
+from collections import deque
+
+import numpy as np
+
+TRADING_DAYS = 252
+
+
+# ---------------- RUNNING INDICATORS ----------------
+# Every indicator keeps O(1) state: push() commits a closed bar, peek()
+# returns the value the indicator would have if the bar were pushed,
+# without mutating anything (used for the still-forming latest bar).
+
+class SMA:
+    __slots__ = ("n", "window", "total")
+
+    def __init__(self, n: int):
+        self.n = n
+        self.window = deque(maxlen=n)
+        self.total = 0.0
+
+    def push(self, x: float):
+        if len(self.window) == self.n:
+            self.total -= self.window[0]
+        self.window.append(x)
+        self.total += x
+
+    def peek(self, x: float):
+        if len(self.window) == self.n:
+            return (self.total - self.window[0] + x) / self.n
+        if len(self.window) + 1 == self.n:
+            return (self.total + x) / self.n
+        return None
+
+
+class EMA:
+    __slots__ = ("n", "alpha", "value", "count")
+
+    def __init__(self, n: int):
+        self.n = n
+        self.alpha = 2.0 / (n + 1)
+        self.value = None
+        self.count = 0
+
+    def _next(self, x: float) -> float:
+        # Seeded with the first value, like pandas ewm(adjust=False)
+        return x if self.value is None else self.value + self.alpha * (x - self.value)
+
+    def push(self, x: float):
+        self.value = self._next(x)
+        self.count += 1
+
+    def peek(self, x: float):
+        return self._next(x) if self.count + 1 >= self.n else None
+
+
+class Wilder:
+    # Wilder smoothing seeded with the simple mean of the first n inputs
+    __slots__ = ("n", "value", "count", "seed")
+
+    def __init__(self, n: int):
+        self.n = n
+        self.value = None
+        self.count = 0
+        self.seed = 0.0
+
+    def _next(self, x: float):
+        if self.value is not None:
+            return (self.value * (self.n - 1) + x) / self.n
+        if self.count + 1 == self.n:
+            return (self.seed + x) / self.n
+        return None
+
+    def push(self, x: float):
+        if self.value is None and self.count + 1 < self.n:
+            self.seed += x
+        else:
+            self.value = self._next(x)
+        self.count += 1
+
+    def peek(self, x: float):
+        return self._next(x)
+
+
+class RSI:
+    __slots__ = ("gain", "loss", "prev")
+
+    def __init__(self, n: int = 14):
+        self.gain = Wilder(n)
+        self.loss = Wilder(n)
+        self.prev = None
+
+    @staticmethod
+    def _rsi(gain, loss):
+        if gain is None or loss is None:
+            return None
+        if loss == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + gain / loss)
+
+    def push(self, close: float):
+        if self.prev is not None:
+            change = close - self.prev
+            self.gain.push(max(change, 0.0))
+            self.loss.push(max(-change, 0.0))
+        self.prev = close
+
+    def peek(self, close: float):
+        if self.prev is None:
+            return None
+        change = close - self.prev
+        return self._rsi(self.gain.peek(max(change, 0.0)), self.loss.peek(max(-change, 0.0)))
+
+
+class MACD:
+    __slots__ = ("fast", "slow", "signal")
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+
+    def push(self, close: float):
+        self.fast.push(close)
+        self.slow.push(close)
+        if self.slow.count >= self.slow.n:
+            self.signal.push(self.fast.value - self.slow.value)
+
+    def peek(self, close: float):
+        fast, slow = self.fast.peek(close), self.slow.peek(close)
+        if fast is None or slow is None:
+            return None, None, None
+        macd = fast - slow
+        signal = self.signal.peek(macd)
+        return macd, signal, None if signal is None else macd - signal
+
+
+class ATR:
+    __slots__ = ("tr", "prev")
+
+    def __init__(self, n: int = 14):
+        self.tr = Wilder(n)
+        self.prev = None
+
+    def _true_range(self, high, low):
+        if self.prev is None:
+            return high - low
+        return max(high - low, abs(high - self.prev), abs(low - self.prev))
+
+    def push(self, high: float, low: float, close: float):
+        self.tr.push(self._true_range(high, low))
+        self.prev = close
+
+    def peek(self, high: float, low: float):
+        return self.tr.peek(self._true_range(high, low))
+
+
+class RollingVolatility:
+    __slots__ = ("n", "window", "total", "total_sq", "prev", "periods_per_year")
+
+    def __init__(self, n: int = 20, periods_per_year: float = TRADING_DAYS):
+        self.n = n
+        self.periods_per_year = periods_per_year
+        self.window = deque(maxlen=n)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.prev = None
+
+    def push(self, close: float):
+        if self.prev:
+            r = close / self.prev - 1.0
+            if len(self.window) == self.n:
+                old = self.window[0]
+                self.total -= old
+                self.total_sq -= old * old
+            self.window.append(r)
+            self.total += r
+            self.total_sq += r * r
+        self.prev = close
+
+    def peek(self, close: float):
+        if not self.prev:
+            return None
+        r = close / self.prev - 1.0
+        total, total_sq, count = self.total + r, self.total_sq + r * r, len(self.window) + 1
+        if len(self.window) == self.n:
+            old = self.window[0]
+            total, total_sq, count = total - old, total_sq - old * old, self.n
+        if count < self.n:
+            return None
+        var = (total_sq - total * total / count) / (count - 1)
+        return math.sqrt(max(var, 0.0)) * math.sqrt(self.periods_per_year)
+
+
+# ---------------- PER-SYMBOL STATE ----------------
+INDICATORS = ("sma", "ema", "rsi", "macd", "atr", "volatility")
+
+
+class SymbolIndicators:
+    def __init__(self, periods_per_year: float = TRADING_DAYS):
+        self.last_ts = None
+        self.sma = SMA(20)
+        self.ema = EMA(20)
+        self.rsi = RSI(14)
+        self.macd = MACD(12, 26, 9)
+        self.atr = ATR(14)
+        self.volatility = RollingVolatility(20, periods_per_year)
+
+    def push(self, ts, high: float, low: float, close: float):
+        self.sma.push(close)
+        self.ema.push(close)
+        self.rsi.push(close)
+        self.macd.push(close)
+        self.atr.push(high, low, close)
+        self.volatility.push(close)
+        self.last_ts = ts
+
+    def peek(self, high: float, low: float, close: float, names=INDICATORS) -> dict:
+        out = {}
+        if "sma" in names:
+            out["sma_20"] = self.sma.peek(close)
+        if "ema" in names:
+            out["ema_20"] = self.ema.peek(close)
+        if "rsi" in names:
+            out["rsi_14"] = self.rsi.peek(close)
+        if "macd" in names:
+            out["macd"], out["macd_signal"], out["macd_hist"] = self.macd.peek(close)
+        if "atr" in names:
+            out["atr_14"] = self.atr.peek(high, low)
+        if "volatility" in names:
+            out["volatility_20"] = self.volatility.peek(close)
+        return out
+
+
+# ---------------- ENGINE ----------------
+class IndicatorEngine:
+    def __init__(self):
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def update(self, symbol: str, bars, names=INDICATORS, interval: str = "1d",
+               periods_per_year: float = TRADING_DAYS) -> dict:
+        # All bars but the newest are committed; the newest may still be
+        # forming, so it is only peeked. Only bars after the last committed
+        # timestamp are pushed, so a repeat call costs O(new bars).
+        names = [n for n in names if n in INDICATORS]
+        if bars is None or not len(bars):
+            return {}
+
+        ts, high, low, close = bars.ts, bars.high, bars.low, bars.close
+
+        with self._lock:
+            state = self._states.get((symbol, interval))
+            start = 0
+            if state is not None and state.last_ts is not None:
+                pos = int(np.searchsorted(ts, state.last_ts))
+                if pos < len(ts) - 1 and ts[pos] == state.last_ts:
+                    start = pos + 1
+                else:
+                    state = None
+            if state is None:
+                state = self._states[(symbol, interval)] = SymbolIndicators(periods_per_year)
+
+            # high/low may be float32; the running sums stay in float64
+            for i in range(start, len(ts) - 1):
+                state.push(int(ts[i]), float(high[i]), float(low[i]), float(close[i]))
+
+            values = state.peek(float(high[-1]), float(low[-1]), float(close[-1]), names)
+        return {k: None if v is None else float(v) for k, v in values.items()}
+
+    def reset(self, symbol: str = None):
+        with self._lock:
+            if symbol is None:
+                self._states.clear()
+            else:
+                for key in [k for k in self._states if k[0] == symbol]:
+                    del self._states[key]
+
+
+indicator_engine = IndicatorEngine()
@@ -0,0 +1,192 @@
+# intents.py
+import os
+import re
+from collections import deque
+from functools import lru_cache
+from typing import NamedTuple, Tuple
+
+# ---------------- VOCABULARY ----------------
+# Order matters: the first intent found in this order is the primary one,
+# matching the old trend > buy > sell precedence.
+INTENT_PHRASES = {
+    "trend": [
+        "trend", "trends", "trending", "uptrend", "downtrend", "direction", "momentum",
+        "outlook", "heading", "going up", "going down", "moving",
+    ],
+    "buy": [
+        "buy", "buying", "purchase", "invest", "investing", "accumulate", "go long",
+        "enter", "entry point", "add more", "pick up",
+    ],
+    "sell": [
+        "sell", "selling", "sell off", "exit", "dump", "offload", "short", "go short",
+        "take profit", "book profit", "get out", "cash out",
+    ],
+    "risk": ["risk", "risky", "volatile", "volatility", "safe", "drawdown"],
+    "forecast": ["predict", "prediction", "forecast", "target price", "price target", "tomorrow"],
+}
+
+# Longer phrases that contain an intent word but mean something else;
+# leftmost-longest matching lets them swallow the shorter word.
+NON_INTENT_PHRASES = [
+    "buyback", "buy back", "buy-back", "buybacks",
+    "sell-off", "selloff", "sell-offs", "selloffs",
+    "short-term", "short term", "shortterm", "in short",
+]
+
+NAME_SUFFIXES = re.compile(
+    r"\b(inc|incorporated|corp|corporation|co|company|ltd|limited|plc|ag|sa|nv|se|holdings?|group|"
+    r"class [abc]|the)\b\.?", re.I,
+)
+# Short company names that are also everyday words
+AMBIGUOUS_NAMES = {
+    "target", "block", "gap", "shell", "general", "visa", "first", "united", "national", "air", "vow",
+    "trip", "sea", "southern", "snap", "booking", "lucid", "capri", "vale", "affirm", "anthem",
+    "upstart", "tapestry", "titan", "ventas",
+}
+
+
+# ---------------- AHO-CORASICK ----------------
+class Automaton:
+    # Multi-pattern matcher: one pass over the text finds every pattern.
+    def __init__(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        self.patterns = []  # (length, payload)
+
+    def add(self, pattern: str, payload):
+        node = 0
+        for ch in pattern:
+            nxt = self.goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[node][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            node = nxt
+        self.out[node].append(len(self.patterns))
+        self.patterns.append((len(pattern), payload))
+
+    def build(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[child] = self.goto[f].get(ch, 0) if self.goto[f].get(ch) != child else 0
+                self.out[child] = self.out[child] + self.out[self.fail[child]]
+        return self
+
+    def find(self, text: str):
+        # Leftmost-longest, non-overlapping matches on word boundaries
+        goto, fail, out, patterns = self.goto, self.fail, self.out, self.patterns
+        hits = []
+        node = 0
+        n = len(text)
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for pid in out[node]:
+                length, payload = patterns[pid]
+                start = i - length + 1
+                if (start == 0 or not text[start - 1].isalnum()) and (i + 1 == n or not text[i + 1].isalnum()):
+                    hits.append((start, -length, payload))
+
+        hits.sort()
+        chosen, end = [], -1
+        for start, neg_len, payload in hits:
+            if start > end:
+                chosen.append(payload)
+                end = start - neg_len - 1
+        return chosen
+
+
+# ---------------- ENGINE ----------------
+class ParsedQuestion(NamedTuple):
+    intent: str
+    intents: Tuple[str, ...]
+    symbols: Tuple[str, ...]
+
+
+class IntentEngine:
+    def __init__(self, entries=(), cache_size: int = 4096):
+        self.words = Automaton()
+        for intent, phrases in INTENT_PHRASES.items():
+            for phrase in phrases:
+                self.words.add(phrase, ("intent", intent))
+        for phrase in NON_INTENT_PHRASES:
+            self.words.add(phrase, ("ignore", None))
+
+        # Tickers are matched case-sensitively so "all" never means Allstate
+        self.tickers = Automaton()
+        seen_bases, seen_names = set(), set()
+        for item in entries:
+            symbol = item["symbol"]
+            self.tickers.add(symbol, ("symbol", symbol))
+            self.tickers.add(f"${symbol}", ("symbol", symbol))
+            base = symbol.split(".")[0]
+            if base != symbol and base not in seen_bases and not base.isdigit():
+                # RELIANCE -> RELIANCE.NS (first listing in the catalogue wins)
+                seen_bases.add(base)
+                self.tickers.add(base, ("symbol", symbol))
+                if len(base) >= 3 and base.lower() not in AMBIGUOUS_NAMES:
+                    # Local tickers double as names people type ("tcs", "infy")
+                    self.words.add(base.lower(), ("symbol", symbol))
+
+            for name in self._name_forms(item["name"]) - seen_names:
+                # "reliance industries" -> RELIANCE.NS, not its (BSE) listing
+                seen_names.add(name)
+                self.words.add(name, ("symbol", symbol))
+
+        self.words.build()
+        self.tickers.build()
+        self.parse = lru_cache(maxsize=cache_size)(self._parse)
+
+    @staticmethod
+    def _name_forms(name: str):
+        # "Amazon.com Inc." -> amazon.com inc, amazon com inc, amazon inc,
+        # amazon.com, amazon com, amazon. Qualifiers such as "(BSE)", "(UK)"
+        # or "(Class A)" are not part of what people type.
+        bare = re.sub(r"\([^)]*\)", " ", name.lower())
+        variants = (
+            bare,                                # as written
+            re.sub(r"[^\w&'-]+", " ", bare),     # punctuation as spaces
+            re.sub(r"\.com\b", " ", bare),       # domain-style names
+        )
+        forms = set()
+        for text in variants:
+            full = re.sub(r"\s+", " ", text).strip(" .,&-")
+            short = re.sub(r"\s+", " ", NAME_SUFFIXES.sub(" ", full)).strip(" .,&-")
+            if full:
+                forms.add(full)
+            if len(short) >= 3 and short not in AMBIGUOUS_NAMES:
+                forms.add(short)
+        return forms
+
+    def _parse(self, question: str) -> ParsedQuestion:
+        intents, symbols = [], []
+        for kind, value in self.words.find(question.lower()):
+            if kind == "intent" and value not in intents:
+                intents.append(value)
+            elif kind == "symbol" and value not in symbols:
+                symbols.append(value)
+        for _, symbol in self.tickers.find(question):
+            # Bare one-letter tickers (O, T, V...) need a $ prefix
+            if symbol not in symbols and (len(symbol) > 1 or f"${symbol}" in question):
+                symbols.append(symbol)
+
+        primary = next((i for i in INTENT_PHRASES if i in intents and i in ("trend", "buy", "sell")), "general")
+        return ParsedQuestion(primary, tuple(intents), tuple(symbols))
+
+
+def _build() -> IntentEngine:
+    from catalogue import catalogue
+    return IntentEngine(catalogue.entries, int(os.getenv("INTENT_CACHE_SIZE", "4096")))
+
+
+intent_engine = _build()
@@ -0,0 +1,146 @@
+# intraday.py
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from bars import BarSeries
+
+COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+
+# ---------------- RING BUFFER ----------------
+class RingBuffer:
+    # Fixed-capacity bars for one (symbol, interval): bar times as int64 ns
+    # and OHLCV as one float64 block. Once full, each new bar overwrites the
+    # oldest, so memory never grows past capacity.
+    __slots__ = ("capacity", "ts", "values", "start", "size", "tz")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.ts = np.zeros(capacity, dtype=np.int64)
+        self.values = np.zeros((capacity, len(COLUMNS)))
+        self.start = 0
+        self.size = 0
+        self.tz = None
+
+    def last_ts(self):
+        if not self.size:
+            return None
+        return int(self.ts[(self.start + self.size - 1) % self.capacity])
+
+    def extend(self, ts: np.ndarray, values: np.ndarray):
+        # Bars older than the newest stored one are ignored; a bar with the
+        # same time replaces it (the newest bar may still be forming).
+        last = self.last_ts()
+        if last is not None:
+            same = ts == last
+            if same.any():
+                self.values[(self.start + self.size - 1) % self.capacity] = values[same][-1]
+            newer = ts > last
+            ts, values = ts[newer], values[newer]
+
+        n = len(ts)
+        if n == 0:
+            return
+        if n >= self.capacity:
+            self.ts[:] = ts[-self.capacity:]
+            self.values[:] = values[-self.capacity:]
+            self.start, self.size = 0, self.capacity
+            return
+
+        pos = (self.start + self.size + np.arange(n)) % self.capacity
+        self.ts[pos] = ts
+        self.values[pos] = values
+        overflow = max(0, self.size + n - self.capacity)
+        self.start = (self.start + overflow) % self.capacity
+        self.size = min(self.capacity, self.size + n)
+
+    def series(self, stale: bool = False) -> BarSeries:
+        # Oldest first, bars without a close dropped; copies, so the ring
+        # can keep overwriting while the series is in use
+        order = (self.start + np.arange(self.size)) % self.capacity
+        values = self.values[order]
+        keep = ~np.isnan(values[:, 3])
+        ts, values = self.ts[order][keep], values[keep]
+        return BarSeries(
+            ts,
+            values[:, 0].astype(np.float32),
+            values[:, 1].astype(np.float32),
+            values[:, 2].astype(np.float32),
+            values[:, 3].copy(),
+            values[:, 4].copy(),
+            self.tz, stale,
+        )
+
+    def nbytes(self) -> int:
+        return self.ts.nbytes + self.values.nbytes
+
+
+# ---------------- STORE ----------------
+class IntradayStore:
+    # (symbol, interval) -> RingBuffer, least recently used buffers are
+    # dropped beyond max_buffers, bounding total memory as well.
+    def __init__(self, capacity: int = 2000, max_buffers: int = 256):
+        self.capacity = capacity
+        self.max_buffers = max_buffers
+        self._buffers = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def last_time(self, symbol: str, interval: str):
+        with self._lock:
+            ring = self._buffers.get((symbol, interval))
+            last = ring.last_ts() if ring is not None else None
+            tz = ring.tz if ring is not None else None
+        if last is None:
+            return None
+        import pandas as pd
+
+        return pd.Timestamp(last, tz="UTC").tz_convert(tz) if tz else pd.Timestamp(last, tz="UTC")
+
+    def merge(self, symbol: str, interval: str, hist: "pd.DataFrame") -> BarSeries:
+        # Folds downloaded bars into the buffer and returns everything buffered
+        with self._lock:
+            key = (symbol, interval)
+            ring = self._buffers.get(key)
+            if ring is None:
+                ring = self._buffers[key] = RingBuffer(self.capacity)
+                while len(self._buffers) > self.max_buffers:
+                    self._buffers.popitem(last=False)
+                    self.evictions += 1
+            self._buffers.move_to_end(key)
+
+            if hist is not None and not hist.empty:
+                index = hist.index if hist.index.tz is not None else hist.index.tz_localize("UTC")
+                ring.tz = ring.tz or str(index.tz)
+                values = np.column_stack([
+                    hist[c].to_numpy(dtype=float) if c in hist else np.full(len(hist), np.nan)
+                    for c in COLUMNS
+                ])
+                ring.extend(index.as_unit("ns").asi8, values)
+            return ring.series()
+
+    def series(self, symbol: str, interval: str, stale: bool = False):
+        with self._lock:
+            ring = self._buffers.get((symbol, interval))
+            return ring.series(stale) if ring is not None and ring.size else None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "buffers": len(self._buffers),
+                "max_buffers": self.max_buffers,
+                "capacity_bars": self.capacity,
+                "bars": sum(r.size for r in self._buffers.values()),
+                "bytes": sum(r.nbytes() for r in self._buffers.values()),
+                "evictions": self.evictions,
+            }
+
+
+# ---------------- SHARED INSTANCES ----------------
+intraday_bars = IntradayStore(
+    capacity=int(os.getenv("INTRADAY_BARS", "2000")),
+    max_buffers=int(os.getenv("INTRADAY_BUFFERS", "256")),
+)
@@ -0,0 +1,53 @@
+# lifecycle.py
+import importlib
+import threading
+import time
+
+import metrics
+
+
+# ---------------- LIFECYCLE ----------------
+class Lifecycle:
+    # Cold-start bookkeeping: how long each phase took, which heavy modules
+    # were deferred and when the process became ready to take traffic.
+    def __init__(self):
+        self.started = time.time()
+        self.phases = {}
+        self.ready = False
+        self.ready_at = None
+        self.warmed = []
+        self._lock = threading.Lock()
+
+    def mark(self, phase: str, seconds: float):
+        self.phases[phase] = seconds
+        metrics.startup_seconds.set(seconds, phase=phase)
+
+    def lazy(self, name: str):
+        # Imports a module on first use and records what that first use cost.
+        # Always through import_module: it is a dict lookup once the module
+        # is loaded, and blocks on the import lock while another thread is
+        # still initialising it (sys.modules would hand out a half-built one).
+        t0 = time.perf_counter()
+        module = importlib.import_module(name)
+        phase = f"import:{name}"
+        if phase not in self.phases:
+            with self._lock:
+                if phase not in self.phases:
+                    self.mark(phase, time.perf_counter() - t0)
+        return module
+
+    def set_ready(self):
+        self.ready = True
+        self.ready_at = time.time()
+        self.mark("ready", self.ready_at - self.started)
+
+    def status(self) -> dict:
+        return {
+            "ready": self.ready,
+            "uptime_seconds": time.time() - self.started,
+            "phases": dict(self.phases),
+            "warmed": list(self.warmed),
+        }
+
+
+lifecycle = Lifecycle()
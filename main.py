@@ -1,27 +1,97 @@
 # backend.py
-from fastapi import FastAPI
+import time
+from lifecycle import lifecycle  # first, so the import phase is timed from here
+IMPORT_STARTED = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
-import yfinance as yf
-import pandas as pd
+from typing import Dict, List, Optional
+import asyncio
+import json
 import numpy as np
-from sklearn.linear_model import LinearRegression
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+import hashlib
 import os
 
-app = FastAPI(title="AI Stock Market Assistant API")
+import analytics
+from bars import BarSeries, aligned_returns, close_matrix
+import execution
+import metrics
+from bar_store import PERIOD_DAYS, bar_store
+import markets
+from cache import analysis_cache, bar_cache, forecast_cache, returns_cache
+from catalogue import catalogue
+from history import history_db, history_sink
+from indicators import indicator_engine
+from intraday import intraday_bars
+from intents import intent_engine
+from predictors import MODELS, MODEL_VERSION, predictor_registry
+from scheduler import PrefetchScheduler
+from screener import universe_snapshot
+from shared_bars import shared_bars
+from streaming import PriceHub, Subscriber
+from upstream import upstream
+
+def yf():
+    # yfinance (requests, curl_cffi, bs4, ...) is the slowest import; it
+    # is loaded on first use or during warm-up, not before we can serve.
+    return lifecycle.lazy("yfinance")
+
+try:
+    # orjson is optional; it serializes the bigger payloads several times faster
+    import orjson
+
+    class DefaultResponse(JSONResponse):
+        def render(self, content) -> bytes:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:
+    DefaultResponse = JSONResponse
+
+lifecycle.mark("import", time.perf_counter() - IMPORT_STARTED)
+
+app = FastAPI(title="AI Stock Market Assistant API", default_response_class=DefaultResponse)
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "ETag", "Last-Modified"],
 )
+app.add_middleware(GZipMiddleware, minimum_size=int(os.getenv("GZIP_MIN_SIZE", "1024")))
+
+
+@app.middleware("http")
+async def timing_middleware(request: Request, call_next):
+    timings = metrics.begin_request()
+    t0 = time.perf_counter()
+    response = await call_next(request)
+    total = time.perf_counter() - t0
+
+    route = request.scope.get("route")
+    metrics.http_seconds.observe(
+        total,
+        method=request.method,
+        path=getattr(route, "path", "unmatched"),
+        status=response.status_code,
+    )
+    response.headers["Server-Timing"] = metrics.server_timing(timings, total)
+    return response
 
 # ---------------- MODELS ----------------
 class StockQuery(BaseModel):
     stock: str
     question: str
+    # Any of: sma, ema, rsi, macd, atr, volatility
+    indicators: Optional[List[str]] = None
+    # linear, ridge, holt or rls; omitted keeps the default trend fit
+    model: Optional[str] = None
+    # 1m, 5m, 15m or 1d bars
+    interval: str = "1d"
 
 class StockResponse(BaseModel):
     stock: str
@@ -31,6 +101,84 @@ class StockResponse(BaseModel):
     bot_reply: str
     intent_detected: str
     confidence_score: float
+    indicators: Optional[Dict[str, Optional[float]]] = None
+    model: Optional[str] = None
+    intents: Optional[List[str]] = None
+    mentioned_stocks: Optional[List[str]] = None
+    stale: bool = False
+    interval: str = "1d"
+
+class BatchQuery(BaseModel):
+    stocks: List[str]
+    question: str = ""
+
+class BatchItem(BaseModel):
+    stock: str
+    current_price: float = 0.0
+    predicted_price: float = 0.0
+    volatility: float = 0.0
+    risk_preference: str = "unknown"
+    confidence_score: float = 0.0
+    stale: bool = False
+    error: Optional[str] = None
+
+class BatchResponse(BaseModel):
+    intent_detected: str
+    results: List[BatchItem]
+
+class HistoryRow(BaseModel):
+    id: int
+    timestamp: str
+    stock: str
+    question: Optional[str] = None
+    current_price: Optional[float] = None
+    predicted_price: Optional[float] = None
+    risk: Optional[str] = None
+    intent: Optional[str] = None
+    confidence: Optional[float] = None
+    realized_price: Optional[float] = None
+    interval: str = "1d"
+
+class HistoryPage(BaseModel):
+    rows: List[HistoryRow]
+    next_cursor: Optional[str] = None
+
+class HistoryStats(BaseModel):
+    stock: str
+    # Accuracy is only scored for 1d forecasts; intraday rows count requests
+    interval: str = "1d"
+    requests: int
+    first_seen: str
+    last_seen: str
+    avg_confidence: Optional[float] = None
+    realized: int
+    mae: Optional[float] = None
+    mape: Optional[float] = None
+    hit_rate: Optional[float] = None
+
+class PortfolioQuery(BaseModel):
+    holdings: Dict[str, float]
+    confidence: float = 0.95
+    period: str = "6mo"
+
+class RiskContribution(BaseModel):
+    stock: str
+    weight: float
+    marginal: float
+    component: float
+    percent: float
+
+class PortfolioRisk(BaseModel):
+    stocks: List[str]
+    observations: int
+    confidence: float
+    volatility: float
+    covariance: List[List[float]]
+    correlation: List[List[float]]
+    var: Dict[str, float]
+    cvar: Dict[str, float]
+    contributions: List[RiskContribution]
+    errors: Dict[str, str] = {}
 
 # ---------------- HELPERS ----------------
 def auto_detect_risk(volatility: float) -> str:
@@ -40,79 +188,203 @@ def auto_detect_risk(volatility: float) -> str:
         return "medium"
     return "low"
 
-FILE_PATH = r"C:\Users\pds217\Documents\project\stock_analysis_data.csv"
-
-def save_user_history(row: dict):
-    try:
-        os.makedirs(os.path.dirname(FILE_PATH), exist_ok=True)
-
-        new_df = pd.DataFrame([row])
+# Finished daily bars handed to the history index to realize forecasts
+REALIZE_BARS = int(os.getenv("REALIZE_BARS", "10"))
 
-        if os.path.exists(FILE_PATH):
-            new_df.to_csv(FILE_PATH, mode="a", header=False, index=False)
-        else:
-            new_df.to_csv(FILE_PATH, index=False)
-
-    except PermissionError:
-        # If Excel is open, skip saving
-        print("CSV file is open. Close Excel and try again.")
+def settled_closes(symbol: str, bars: BarSeries) -> list:
+    # (exchange date, close) of the latest finished daily bars; while the
+    # market is open the last bar may still be forming, so it is left out
+    days = bars.days().astype("datetime64[D]").astype(str)
+    end = len(bars) - 1 if markets.is_open(markets.market_for(symbol)) else len(bars)
+    start = max(end - REALIZE_BARS, 0)
+    return [(str(d), float(c)) for d, c in zip(days[start:end], bars.close[start:end])]
 
+def save_user_history(row: dict):
+    # Buffered and flushed by a background thread; never blocks the request
+    history_sink.record(row)
 
 
 # ---------------- SERVICES ----------------
+# How long bars served from disk during an upstream outage stay cached
+# (the shared store applies the same limit to stale entries)
+STALE_TTL = float(os.getenv("STALE_BAR_TTL", "30"))
+
 class StockService:
     @staticmethod
-    def fetch(symbol: str):
+    def download(symbol: str, period: str = "6mo", interval: str = "1d"):
+        t = yf().Ticker(symbol)
+        history = lambda **kw: upstream.call("history", t.history, auto_adjust=True, **kw)
+
         try:
-            t = yf.Ticker(symbol)
-            hist = t.history(period="6mo", interval="1d", auto_adjust=True)
+            if markets.is_intraday(interval):
+                # The ring buffers hold arrays already
+                bars = StockService.top_up_intraday(symbol, period, interval, history)
+            else:
+                # Persistent store: only the missing tail is requested upstream
+                bars = StockService.to_bars(bar_store.load(symbol, period, interval, history))
+        except Exception:
+            # Upstream is failing: answer from the last good bars we hold
+            if markets.is_intraday(interval):
+                bars = intraday_bars.series(symbol, interval, stale=True)
+            else:
+                hist = bar_store.last_good(symbol, period, interval)
+                bars = StockService.to_bars(hist, stale=True) if hist is not None else None
+            if bars is None:
+                raise
 
-            # ---------- HARD SAFETY CHECK ----------
-            if hist is None or hist.empty:
-                raise ValueError("No market data returned from Yahoo Finance")
+        # ---------- HARD SAFETY CHECK ----------
+        if bars is None or len(bars) == 0:
+            raise ValueError("No market data returned from Yahoo Finance")
 
-            if "Close" not in hist.columns:
-                raise ValueError("Close price column missing in market data")
+        if len(bars) < 10:
+            raise ValueError("Not enough historical data available")
 
-            hist = hist.dropna(subset=["Close"])
+        return bars
 
-            if len(hist) < 10:
-                raise ValueError("Not enough historical data available")
+    @staticmethod
+    def to_bars(hist, stale: bool = False):
+        # DataFrame edge: past this point bars are flat arrays
+        if hist is None or hist.empty:
+            return None
+        if "Close" not in hist.columns:
+            raise ValueError("Close price column missing in market data")
+        return BarSeries.from_frame(hist.dropna(subset=["Close"]), stale=stale)
 
-            returns = hist["Close"].pct_change().dropna()
+    @staticmethod
+    def top_up_intraday(symbol: str, period: str, interval: str, history):
+        # Intraday bars live in a fixed-size ring buffer per symbol; once it
+        # is warm, only bars from the newest buffered one onwards are requested
+        last = intraday_bars.last_time(symbol, interval)
+        horizon = timedelta(days=PERIOD_DAYS.get(period, 5) - 1)
+        if last is None or datetime.now(timezone.utc) - last > horizon:
+            bars = history(period=period, interval=interval)
+        else:
+            bars = history(start=last.to_pydatetime(), interval=interval)
+        return intraday_bars.merge(symbol, interval, bars)
 
-            if returns.empty:
+    @staticmethod
+    def load(symbol: str, period: str = "6mo", interval: str = "1d", ttl: float = None):
+        # With several workers, one of them downloads and the rest map its
+        # bars; intraday bars stay in this worker's bounded ring buffers
+        if shared_bars is None or markets.is_intraday(interval):
+            return StockService.download(symbol, period, interval)
+        return shared_bars.load(
+            (symbol, period, interval),
+            lambda: StockService.download(symbol, period, interval),
+            ttl if ttl is not None else bar_cache.ttl,
+        )
+
+    @staticmethod
+    def fetch(symbol: str, period: str = "6mo", interval: str = "1d"):
+        try:
+            # Concurrent requests for the same key share one upstream download
+            ttl = markets.cache_ttl(symbol, min(bar_cache.ttl, markets.interval_seconds(interval)))
+            # Stale bars are kept only briefly so upstream is retried soon;
+            # the TTL is set once when they are loaded, never on a hit
+            bars = bar_cache.get_or_load(
+                (symbol, period, interval),
+                lambda: StockService.load(symbol, period, interval, ttl),
+                ttl=lambda loaded: STALE_TTL if loaded.stale else ttl,
+            )
+
+            close = bars.close
+            returns = close[1:] / close[:-1] - 1.0
+
+            if len(returns) < 2:
                 volatility = 0.0
             else:
-                volatility = returns.std() * np.sqrt(252)
+                volatility = float(returns.std(ddof=1) * np.sqrt(markets.bars_per_year(symbol, interval)))
 
-            current_price = float(hist["Close"].iloc[-1])
+            current_price = float(close[-1])
 
-            return hist, current_price, volatility
+            universe_snapshot.update(symbol, bars, period, interval)
+
+            return bars, current_price, volatility
 
         except Exception as e:
             raise ValueError(f"Data fetch failed: {str(e)}")
 
+    @staticmethod
+    def fetch_many(symbols: List[str], period: str = "6mo", interval: str = "1d"):
+        hists, errors = {}, {}
+
+        missing = []
+        for symbol in symbols:
+            key = (symbol, period, interval)
+            bars = bar_cache.get(key)
+            if bars is None and shared_bars is not None:
+                # Another worker may already have these bars mapped
+                bars = shared_bars.get(key, markets.cache_ttl(symbol, bar_cache.ttl))
+                if bars is not None:
+                    bar_cache.set(key, bars, ttl=markets.cache_ttl(symbol, bar_cache.ttl))
+            if bars is None:
+                missing.append(symbol)
+            else:
+                hists[symbol] = bars
+
+        if missing:
+            # One grouped upstream call for every symbol not already cached
+            try:
+                data = upstream.call(
+                    "download", yf().download,
+                    missing, period=period, interval=interval,
+                    group_by="ticker", auto_adjust=True,
+                    threads=True, progress=False,
+                )
+            except Exception as e:
+                data = None
+                for symbol in missing:
+                    hist = bar_store.last_good(symbol, period, interval)
+                    if hist is None or hist.empty:
+                        errors[symbol] = f"Data fetch failed: {str(e)}"
+                    else:
+                        bars = StockService.to_bars(hist, stale=True)
+                        bar_cache.set((symbol, period, interval), bars, ttl=STALE_TTL)
+                        hists[symbol] = bars
+                missing = []
+
+            for symbol in missing:
+                try:
+                    if data.columns.nlevels > 1:
+                        if symbol not in data.columns.get_level_values(0):
+                            raise ValueError("No market data returned from Yahoo Finance")
+                        hist = data[symbol]
+                    else:
+                        hist = data
+
+                    if hist is None or hist.empty or "Close" not in hist.columns:
+                        raise ValueError("No market data returned from Yahoo Finance")
+
+                    hist = hist.dropna(subset=["Close"])
+
+                    if len(hist) < 10:
+                        raise ValueError("Not enough historical data available")
+
+                    bars = BarSeries.from_frame(hist)
+                    bar_cache.set((symbol, period, interval), bars)
+                    if shared_bars is not None:
+                        shared_bars.put((symbol, period, interval), bars)
+                    hists[symbol] = bars
+                    universe_snapshot.update(symbol, bars, period, interval)
+
+                except Exception as e:
+                    errors[symbol] = f"Data fetch failed: {str(e)}"
+
+        return hists, errors
+
 
 class Predictor:
     @staticmethod
-    def predict(hist):
+    def predict(bars, window: int = None):
         try:
-            if hist is None or hist.empty or len(hist) < 10:
+            if bars is None or len(bars) < 10:
                 return 0.0, 0.0
 
-            df = hist.copy()
-            df = df.dropna(subset=["Close"])
-            df["x"] = range(len(df))
-
-            model = LinearRegression()
-            model.fit(df[["x"]], df["Close"])
-
-            next_price = model.predict(
-                pd.DataFrame([[len(df)]], columns=["x"])
-            )[0]
-
-            confidence = model.score(df[["x"]], df["Close"]) * 100
+            close = bars.close
+            if window:
+                # Intraday fits use only the most recent bars
+                close = close[-window:]
+            next_price, confidence, _ = analytics.trend_forecast(close)
 
             if np.isnan(next_price) or np.isnan(confidence):
                 return 0.0, 0.0
@@ -124,52 +396,201 @@ class Predictor:
 
 
 
+async def forecast(symbol: str, bars, period: str = "6mo", interval: str = "1d"):
+    # Forecasts only change when a bar does, so reuse any pre-computed one
+    key = (symbol, period, interval, int(bars.ts[-1]), float(bars.close[-1]))
+    cached = forecast_cache.get(key)
+    if cached is not None:
+        return cached
+    result = await execution.run_cpu(
+        Predictor.predict, bars, markets.INTERVALS[interval][2], stage="predict"
+    )
+    forecast_cache.set(key, result)
+    return result
+
+
+async def analyse(q, bars, volatility) -> dict:
+    # Everything in a /chat answer that depends on the bars, computed once
+    # per (bars, model, indicators) and shared by every question about them.
+    key = (
+        q.stock, q.interval, int(bars.ts[-1]), float(bars.close[-1]),
+        q.model, MODEL_VERSION, tuple(sorted(q.indicators or ())),
+    )
+    cached = analysis_cache.get(key)
+    if cached is not None:
+        return cached
+
+    if q.model:
+        # Warm per-symbol model state, only new bars are folded in. The
+        # registry lock is shared with save(), so keep it off the event loop
+        # (and out of the process pool, which would not see this state).
+        predicted_price, confidence_score = await execution.run_io(
+            predictor_registry.predict, q.model, q.stock, bars, q.interval, stage="predict"
+        )
+        save = getattr(app.state, "model_save", None)
+        if predictor_registry.save_due() and (save is None or save.done()):
+            # Held on app.state so the task is not garbage-collected mid-save
+            app.state.model_save = asyncio.create_task(
+                execution.run_io(predictor_registry.save, stage="model-save")
+            )
+    else:
+        period = markets.INTERVALS[q.interval][1]
+        predicted_price, confidence_score = await forecast(q.stock, bars, period, q.interval)
+
+    # Technical indicators (incremental per symbol)
+    indicators = None
+    if q.indicators:
+        with metrics.timed("indicators"):
+            indicators = indicator_engine.update(
+                q.stock, bars, q.indicators, q.interval, markets.bars_per_year(q.stock, q.interval)
+            )
+
+    result = {
+        "predicted_price": predicted_price,
+        "confidence_score": confidence_score,
+        "risk_preference": auto_detect_risk(volatility),
+        "indicators": indicators,
+    }
+    analysis_cache.set(key, result)
+    return result
+
+
+def chat_validators(q, bars, parsed) -> dict:
+    # A /chat answer only changes with a new (or still forming) bar, the
+    # model, or how the question is read, so those make up the ETag.
+    last_bar = bars.last_time()
+    identity = (
+        q.stock, q.interval, last_bar.isoformat(), float(bars.close[-1]), q.model, MODEL_VERSION,
+        tuple(sorted(q.indicators or ())), parsed, bool(bars.stale),
+    )
+    tag = hashlib.blake2b(repr(identity).encode(), digest_size=12).hexdigest()
+    max_age = min(bar_cache.ttl, markets.interval_seconds(q.interval))
+    return {
+        "ETag": f'W/"{tag}"',
+        "Last-Modified": format_datetime(last_bar.tz_convert(timezone.utc).to_pydatetime(), usegmt=True),
+        "Cache-Control": f"private, max-age={int(markets.cache_ttl(q.stock, max_age))}",
+    }
+
+
+def returns_matrix(hists: Dict[str, BarSeries], period: str):
+    # Daily returns of every symbol on the dates they all traded. Markets
+    # in different time zones are aligned on the calendar date.
+    symbols = tuple(sorted(hists))
+    key = (symbols, period, tuple(int(hists[s].ts[-1]) for s in symbols))
+
+    def build():
+        return symbols, aligned_returns([hists[s] for s in symbols])
+
+    return returns_cache.get_or_load(key, build)
+
+
 def detect_intent(q):
-    q = q.lower()
-    if "trend" in q:
-        return "trend"
-    if "buy" in q:
-        return "buy"
-    if "sell" in q:
-        return "sell"
-    return "general"
+    return intent_engine.parse(q).intent
 
-# ---------------- API ----------------
-@app.post("/chat", response_model=StockResponse)
-async def chat(q: StockQuery):
+# ---------------- PREFETCH ----------------
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "0") == "1"
+UNIVERSE_FILE = os.getenv("PREFETCH_UNIVERSE")
+
+def load_universe() -> List[str]:
+    # Whole symbol catalogue unless a file with one symbol per line is given
+    if not UNIVERSE_FILE:
+        return catalogue.symbols()
     try:
-        # 1️⃣ Fetch stock data
-        hist, current_price, volatility = StockService.fetch(q.stock)
+        with open(UNIVERSE_FILE, encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    except FileNotFoundError:
+        return []
 
-        # 2️⃣ Predict next price
-        predicted_price, confidence_score = Predictor.predict(hist)
+async def warm_symbol(symbol: str):
+    bars, _, _ = await execution.run_io(StockService.fetch, symbol, stage="fetch")
+    await forecast(symbol, bars)
+
+prefetcher = PrefetchScheduler(load_universe, warm_symbol)
+
+# ---------------- WARM-UP ----------------
+WARMUP_SYMBOLS = int(os.getenv("WARMUP_SYMBOLS", "0"))
+
+async def warm_up():
+    # Runs after startup so /healthz answers at once; /readyz flips when done
+    t0 = time.perf_counter()
+    try:
+        await execution.run_io(lifecycle.lazy, "yfinance", stage="warmup")
+        # Spawn a CPU worker now rather than on the first forecast
+        await execution.run_cpu(
+            analytics.trend_forecast, np.arange(analytics.MIN_BARS, dtype=float), stage="warmup"
+        )
 
-        # 3️⃣ Detect risk level
-        risk_level = auto_detect_risk(volatility)
+        if WARMUP_SYMBOLS and history_db is not None:
+            symbols = await execution.run_io(history_db.top_stocks, WARMUP_SYMBOLS, stage="warmup")
+            results = await asyncio.gather(*(warm_symbol(s) for s in symbols), return_exceptions=True)
+            lifecycle.warmed = [s for s, r in zip(symbols, results) if not isinstance(r, Exception)]
+    except Exception as e:
+        # A failed warm-up only costs latency later; never keep the app unready
+        print(f"Warm-up failed: {str(e)}")
+    lifecycle.mark("warmup", time.perf_counter() - t0)
+    lifecycle.set_ready()
 
-        # 4️⃣ Detect user intent
-        intent_detected = detect_intent(q.question)
+# ---------------- API ----------------
+@app.post("/chat", response_model=StockResponse)
+async def chat(q: StockQuery, request: Request, response: Response):
+    try:
+        # 1️⃣ Fetch stock data
+        if q.interval not in markets.INTERVALS:
+            raise ValueError(f"Unsupported interval '{q.interval}', choose from {', '.join(markets.INTERVALS)}")
+        bars, current_price, volatility = await execution.run_io(
+            StockService.fetch, q.stock, markets.INTERVALS[q.interval][1], q.interval, stage="fetch"
+        )
 
-        # 5️⃣ Create reply message
+        stale = bool(bars.stale)
+
+        # 2️⃣ Detect user intent
+        with metrics.timed("intent"):
+            parsed = intent_engine.parse(q.question)
+            intent_detected = parsed.intent
+
+        # 3️⃣ Predict next price, risk level and indicators (cached per bar)
+        analysis = await analyse(q, bars, volatility)
+        predicted_price = analysis["predicted_price"]
+        confidence_score = analysis["confidence_score"]
+        risk_level = analysis["risk_preference"]
+
+        # 4️⃣ Save user history
+        with metrics.timed("history"):
+            save_user_history({
+                "timestamp": datetime.now().isoformat(),
+                # The exchange's date of the bar the forecast starts from
+                "day": str(bars.days()[-1].astype("datetime64[D]")),
+                "closes": settled_closes(q.stock, bars) if q.interval == "1d" else None,
+                "stock": q.stock,
+                "question": q.question,
+                "current_price": current_price,
+                "predicted_price": predicted_price,
+                "risk": risk_level,
+                "intent": intent_detected,
+                "confidence": confidence_score,
+                "interval": q.interval
+            })
+
+        # 5️⃣ Unchanged since the client's copy: skip building the body
+        headers = chat_validators(q, bars, parsed)
+        if request.headers.get("if-none-match") == headers["ETag"]:
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
+
+        # 6️⃣ Create reply message
+        horizon = "" if q.interval == "1d" else f" (next {q.interval} bar)"
         bot_reply = (
             f"Current Price: ₹{current_price:.2f}\n"
-            f"Predicted Price: ₹{predicted_price:.2f}\n"
+            f"Predicted Price{horizon}: ₹{predicted_price:.2f}\n"
             f"Risk Level: {risk_level.upper()}\n"
             f"Intent: {intent_detected.upper()}\n\n"
             "⚠️ Not financial advice."
         )
-
-        # 6️⃣ Save user history
-        save_user_history({
-            "timestamp": datetime.now().isoformat(),
-            "stock": q.stock,
-            "question": q.question,
-            "current_price": current_price,
-            "predicted_price": predicted_price,
-            "risk": risk_level,
-            "intent": intent_detected,
-            "confidence": confidence_score
-        })
+        others = [s for s in parsed.symbols if s != q.stock]
+        if others:
+            bot_reply += f"\n\nYour question mentions {', '.join(others)}; this answer is for {q.stock}."
+        if stale:
+            bot_reply += f"\n\n⚠️ Live data unavailable; prices as of {bars.last_time():%Y-%m-%d %H:%M}."
 
         # 7️⃣ Return structured response
         return {
@@ -179,11 +600,19 @@ async def chat(q: StockQuery):
             "risk_preference": risk_level,
             "bot_reply": bot_reply,
             "intent_detected": intent_detected,
-            "confidence_score": confidence_score
+            "confidence_score": confidence_score,
+            "indicators": analysis["indicators"],
+            "model": q.model,
+            "intents": list(parsed.intents),
+            "mentioned_stocks": list(parsed.symbols),
+            "stale": stale,
+            "interval": q.interval
         }
 
     except Exception as e:
         # 8️⃣ Error fallback (never crash backend)
+        metrics.chat_failures.inc(error=type(e).__name__)
+        response.headers["Cache-Control"] = "no-store"
         return {
             "stock": q.stock,
             "current_price": 0.0,
@@ -195,3 +624,323 @@ async def chat(q: StockQuery):
         }
 
 
+@app.on_event("startup")
+async def startup():
+    t0 = time.perf_counter()
+    predictor_registry.load()
+    if PREFETCH_ENABLED:
+        prefetcher.start()
+    lifecycle.mark("startup", time.perf_counter() - t0)
+    app.state.warm_up = asyncio.create_task(warm_up())
+
+
+@app.on_event("shutdown")
+def shutdown():
+    prefetcher.stop()
+    predictor_registry.save()
+    execution.shutdown()
+    history_sink.close()
+
+
+@app.get("/healthz")
+def healthz():
+    # Liveness: the process is up and serving
+    return {"status": "ok", "uptime_seconds": lifecycle.status()["uptime_seconds"]}
+
+
+@app.get("/readyz")
+def readyz():
+    # Readiness: warm-up finished, the first real request won't pay for it
+    return JSONResponse(lifecycle.status(), status_code=200 if lifecycle.ready else 503)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    return {
+        "bars": {**bar_cache.stats(), "bytes": sum(b.nbytes() for b in bar_cache.values())},
+        "forecasts": forecast_cache.stats(),
+        "returns": returns_cache.stats(),
+        "analysis": analysis_cache.stats(),
+        "shared_bars": shared_bars.stats() if shared_bars is not None else None,
+        "intraday": intraday_bars.stats(),
+    }
+
+
+@app.get("/symbols")
+def symbols(
+    request: Request,
+    q: str = "",
+    sector: Optional[str] = None,
+    exchange: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=5000),
+):
+    headers = {"ETag": catalogue.etag, "Cache-Control": "public, max-age=3600"}
+    if request.headers.get("if-none-match") == catalogue.etag:
+        return Response(status_code=304, headers=headers)
+
+    return JSONResponse({
+        "version": catalogue.version,
+        "total": len(catalogue.entries),
+        "symbols": catalogue.search(q, limit, sector, exchange),
+    }, headers=headers)
+
+
+@app.get("/models")
+def models():
+    return {"default": "linear", "models": list(MODELS)}
+
+
+@app.get("/upstream/status")
+def upstream_status():
+    return upstream.status()
+
+
+@app.get("/prefetch/status")
+def prefetch_status():
+    return prefetcher.status()
+
+
+@app.post("/chat/batch", response_model=BatchResponse)
+async def chat_batch(q: BatchQuery):
+    symbols = list(dict.fromkeys(s.strip() for s in q.stocks if s.strip()))
+    try:
+        hists, errors = await execution.run_io(
+            StockService.fetch_many, symbols, stage="fetch"
+        )
+    except execution.StageTimeout as e:
+        hists, errors = {}, {s: str(e) for s in symbols}
+
+    results = {s: {"stock": s, "error": errors.get(s)} for s in symbols}
+
+    if hists:
+        # Single vectorized pass over a (bars x symbols) close matrix
+        ok = list(hists)
+        current, volatility, predicted, confidence, risk = await execution.run_cpu(
+            analytics.summarize, close_matrix([hists[s] for s in ok]), stage="predict"
+        )
+
+        for i, s in enumerate(ok):
+            results[s].update({
+                "current_price": float(current[i]),
+                "predicted_price": float(predicted[i]),
+                "volatility": float(volatility[i]),
+                "risk_preference": str(risk[i]),
+                "confidence_score": float(confidence[i]),
+                "stale": bool(hists[s].stale),
+            })
+
+    return {
+        "intent_detected": detect_intent(q.question),
+        "results": [results[s] for s in symbols],
+    }
+
+
+@app.post("/portfolio/risk", response_model=PortfolioRisk)
+async def portfolio_risk(q: PortfolioQuery):
+    holdings = {s.strip(): float(w) for s, w in q.holdings.items() if s.strip() and w}
+    if not holdings:
+        raise HTTPException(status_code=400, detail="No holdings given")
+    if not 0.5 <= q.confidence < 1:
+        raise HTTPException(status_code=400, detail="confidence must be in [0.5, 1)")
+
+    try:
+        hists, errors = await execution.run_io(
+            StockService.fetch_many, list(holdings), q.period, stage="fetch"
+        )
+    except execution.StageTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    if not hists:
+        raise HTTPException(status_code=502, detail="; ".join(f"{s}: {m}" for s, m in errors.items()))
+
+    symbols, returns = await execution.run_io(returns_matrix, hists, q.period, stage="returns")
+    if len(returns) < analytics.MIN_BARS:
+        raise HTTPException(status_code=422, detail="Not enough overlapping bars across holdings")
+
+    weights = np.array([holdings[s] for s in symbols])
+    total = weights.sum()
+    if total <= 0:
+        raise HTTPException(status_code=400, detail="Weights must sum to a positive value")
+    weights = weights / total
+
+    risk = await execution.run_cpu(
+        analytics.portfolio_risk, returns, weights, q.confidence, stage="risk"
+    )
+    return {
+        "stocks": list(symbols),
+        "observations": len(returns),
+        "confidence": q.confidence,
+        "volatility": float(risk["volatility"]),
+        "covariance": risk["covariance"].tolist(),
+        "correlation": risk["correlation"].tolist(),
+        "var": risk["var"],
+        "cvar": risk["cvar"],
+        "contributions": [
+            {
+                "stock": s,
+                "weight": float(weights[i]),
+                "marginal": float(risk["marginal"][i]),
+                "component": float(risk["component"][i]),
+                "percent": float(risk["percent"][i]),
+            }
+            for i, s in enumerate(symbols)
+        ],
+        "errors": errors,
+    }
+
+
+@app.get("/screener")
+def screen(
+    where: str = "",
+    sort: str = "upside",
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    k: int = Query(20, ge=1, le=1000),
+):
+    t0 = time.perf_counter()
+    try:
+        result = universe_snapshot.screen(where, sort, k, descending=order == "desc")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    result["took_ms"] = (time.perf_counter() - t0) * 1000
+    return result
+
+
+@app.post("/screener/refresh")
+async def screener_refresh(chunk: int = Query(50, ge=1, le=500)):
+    # Grouped downloads over the whole universe; cached bars are reused and
+    # rows whose newest bar did not change are left alone.
+    universe = load_universe()
+    failed = {}
+    for i in range(0, len(universe), chunk):
+        try:
+            _, errors = await execution.run_io(
+                StockService.fetch_many, universe[i:i + chunk], stage="fetch"
+            )
+        except execution.StageTimeout as e:
+            errors = {s: str(e) for s in universe[i:i + chunk]}
+        failed.update(errors)
+    return {"universe": len(universe), "rows": len(universe_snapshot), "failed": failed}
+
+
+@app.get("/history", response_model=HistoryPage)
+async def history(
+    stock: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+):
+    if history_db is None:
+        raise HTTPException(status_code=404, detail="History index is disabled")
+    if cursor:
+        try:
+            history_db.parse_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    rows, next_cursor = await execution.run_io(
+        history_db.query, stock, since, until, limit, cursor, stage="history"
+    )
+    return {"rows": rows, "next_cursor": next_cursor}
+
+
+@app.get("/history/stats", response_model=List[HistoryStats])
+async def history_stats(
+    stock: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+):
+    if history_db is None:
+        raise HTTPException(status_code=404, detail="History index is disabled")
+
+    return await execution.run_io(
+        history_db.aggregates, stock, since, until, stage="history"
+    )
+
+
+# ---------------- STREAMING ----------------
+MAX_STREAM_SYMBOLS = 50
+
+async def load_snapshot(symbol: str) -> dict:
+    # Drop the cached bars so the poll tops up the latest bar from upstream;
+    # the refreshed bars are shared with /chat through the cache.
+    bar_cache.invalidate((symbol, "6mo", "1d"))
+    _, current_price, volatility = await execution.run_io(
+        StockService.fetch, symbol, stage="fetch"
+    )
+    return {
+        "stock": symbol,
+        "current_price": current_price,
+        "volatility": float(volatility),
+        "risk": auto_detect_risk(volatility),
+    }
+
+price_hub = PriceHub(load_snapshot)
+
+
+def _parse_symbols(raw) -> List[str]:
+    if isinstance(raw, str):
+        raw = raw.split(",")
+    symbols = [s.strip() for s in raw or [] if isinstance(s, str) and s.strip()]
+    return list(dict.fromkeys(symbols))[:MAX_STREAM_SYMBOLS]
+
+
+@app.websocket("/ws/stream")
+async def stream_ws(ws: WebSocket):
+    # Client sends {"subscribe": [...]} / {"unsubscribe": [...]},
+    # server pushes one JSON snapshot per price change.
+    await ws.accept()
+    sub = Subscriber()
+
+    async def reader():
+        while True:
+            msg = await ws.receive_json()
+            for symbol in _parse_symbols(msg.get("unsubscribe")):
+                price_hub.unsubscribe(symbol, sub)
+            for symbol in _parse_symbols(msg.get("subscribe")):
+                if len(sub.symbols) < MAX_STREAM_SYMBOLS:
+                    price_hub.subscribe(symbol, sub)
+
+    async def writer():
+        while True:
+            await ws.send_json(await sub.get())
+
+    tasks = [asyncio.create_task(reader()), asyncio.create_task(writer())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for t in tasks:
+            t.cancel()
+        price_hub.close(sub)
+
+
+@app.get("/stream")
+async def stream_sse(symbols: str, request: Request):
+    sub = Subscriber()
+    for symbol in _parse_symbols(symbols):
+        price_hub.subscribe(symbol, sub)
+
+    async def events():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    item = await asyncio.wait_for(sub.get(), 15)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"data: {json.dumps(item)}\n\n"
+        finally:
+            price_hub.close(sub)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.get("/stream/stats")
+def stream_stats():
+    return price_hub.stats()
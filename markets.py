@@ -0,0 +1,123 @@
+# markets.py
+import math
+from collections import namedtuple
+from datetime import datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+Market = namedtuple("Market", "name tz open close")
+
+US = Market("US", "America/New_York", time(9, 30), time(16, 0))
+
+# Yahoo ticker suffix -> regular trading session (local exchange time)
+MARKETS = {
+    "NS": Market("NSE", "Asia/Kolkata", time(9, 15), time(15, 30)),
+    "BO": Market("BSE", "Asia/Kolkata", time(9, 15), time(15, 30)),
+    "L": Market("LSE", "Europe/London", time(8, 0), time(16, 30)),
+    "DE": Market("XETRA", "Europe/Berlin", time(9, 0), time(17, 30)),
+    "F": Market("FRA", "Europe/Berlin", time(8, 0), time(22, 0)),
+    "PA": Market("EPA", "Europe/Paris", time(9, 0), time(17, 30)),
+    "AS": Market("AMS", "Europe/Amsterdam", time(9, 0), time(17, 30)),
+    "MI": Market("BIT", "Europe/Rome", time(9, 0), time(17, 30)),
+    "MC": Market("BME", "Europe/Madrid", time(9, 0), time(17, 30)),
+    "SW": Market("SIX", "Europe/Zurich", time(9, 0), time(17, 30)),
+    "HK": Market("HKEX", "Asia/Hong_Kong", time(9, 30), time(16, 0)),
+    "T": Market("TSE", "Asia/Tokyo", time(9, 0), time(15, 30)),
+    "SS": Market("SSE", "Asia/Shanghai", time(9, 30), time(15, 0)),
+    "SZ": Market("SZSE", "Asia/Shanghai", time(9, 30), time(15, 0)),
+    "KS": Market("KRX", "Asia/Seoul", time(9, 0), time(15, 30)),
+    "TW": Market("TWSE", "Asia/Taipei", time(9, 0), time(13, 30)),
+    "AX": Market("ASX", "Australia/Sydney", time(10, 0), time(16, 0)),
+    "SI": Market("SGX", "Asia/Singapore", time(9, 0), time(17, 0)),
+    "TO": Market("TSX", "America/Toronto", time(9, 30), time(16, 0)),
+    "SA": Market("B3", "America/Sao_Paulo", time(10, 0), time(17, 0)),
+}
+
+
+TRADING_DAYS = 252
+
+# interval -> (bar minutes, default download period, bars per forecast fit).
+# Yahoo keeps 1m bars for about a week and other intraday bars for 60 days;
+# intraday forecasts fit recent bars only (~2h, ~1 session, ~4 sessions).
+INTERVALS = {
+    "1m": (1, "5d", 120),
+    "5m": (5, "1mo", 78),
+    "15m": (15, "1mo", 104),
+    "1d": (None, "6mo", None),
+}
+
+
+def market_for(symbol: str) -> Market:
+    suffix = symbol.rsplit(".", 1)[1].upper() if "." in symbol else ""
+    return MARKETS.get(suffix, US)
+
+
+def _session(market: Market, day) -> tuple:
+    tz = ZoneInfo(market.tz)
+    return (
+        datetime.combine(day, market.open, tz),
+        datetime.combine(day, market.close, tz),
+    )
+
+
+def is_open(market: Market, now: datetime = None) -> bool:
+    now = now or datetime.now(timezone.utc)
+    local = now.astimezone(ZoneInfo(market.tz))
+    if local.weekday() >= 5:
+        return False
+    start, end = _session(market, local.date())
+    return start <= now < end
+
+
+def next_open(market: Market, now: datetime = None) -> datetime:
+    # Weekends are skipped; exchange holidays are not modelled.
+    now = now or datetime.now(timezone.utc)
+    day = now.astimezone(ZoneInfo(market.tz)).date()
+    for _ in range(8):
+        if day.weekday() < 5:
+            start, _end = _session(market, day)
+            if start > now:
+                return start
+        day += timedelta(days=1)
+    raise RuntimeError(f"No session found for {market.name}")
+
+
+def next_close(market: Market, now: datetime = None) -> datetime:
+    now = now or datetime.now(timezone.utc)
+    day = now.astimezone(ZoneInfo(market.tz)).date()
+    for _ in range(8):
+        if day.weekday() < 5:
+            _start, end = _session(market, day)
+            if end > now:
+                return end
+        day += timedelta(days=1)
+    raise RuntimeError(f"No session found for {market.name}")
+
+
+def cache_ttl(symbol: str, default: float, cap: float = 12 * 3600) -> float:
+    # Daily bars cannot change while the exchange is closed, so cached bars
+    # stay valid until the next open instead of the short intraday TTL.
+    market = market_for(symbol)
+    now = datetime.now(timezone.utc)
+    if is_open(market, now):
+        return default
+    return max(default, min(cap, (next_open(market, now) - now).total_seconds()))
+
+
+# ---------------- BAR INTERVALS ----------------
+def is_intraday(interval: str) -> bool:
+    return INTERVALS[interval][0] is not None
+
+
+def interval_seconds(interval: str) -> float:
+    minutes = INTERVALS[interval][0]
+    return 24 * 3600.0 if minutes is None else minutes * 60.0
+
+
+def bars_per_year(symbol: str, interval: str = "1d") -> float:
+    # Annualization factor: trading days times bars in the exchange's session
+    minutes = INTERVALS[interval][0]
+    if minutes is None:
+        return float(TRADING_DAYS)
+    market = market_for(symbol)
+    session = (market.close.hour * 60 + market.close.minute) - (market.open.hour * 60 + market.open.minute)
+    return float(TRADING_DAYS * math.ceil(session / minutes))
@@ -0,0 +1,192 @@
+# metrics.py
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+# ---------------- PRIMITIVES ----------------
+class Counter:
+    def __init__(self, name: str, help: str, labels=()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(str(labels.get(k, "")) for k in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labels, key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels=(), buckets=BUCKETS):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.buckets = tuple(buckets)
+        self._values = {}  # key -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(k, "")) for k in self.labels)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[i] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, row in sorted(self._values.items()):
+                for bound, count in zip(self.buckets, row):
+                    lines.append(
+                        f"{self.name}_bucket{_labels(self.labels + ('le',), key + (repr(bound),))} {count}"
+                    )
+                lines.append(f"{self.name}_bucket{_labels(self.labels + ('le',), key + ('+Inf',))} {row[-1]}")
+                lines.append(f"{self.name}_sum{_labels(self.labels, key)} {row[-2]}")
+                lines.append(f"{self.name}_count{_labels(self.labels, key)} {row[-1]}")
+        return lines
+
+
+class Gauge:
+    def __init__(self, name: str, help: str, labels=()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, **labels):
+        key = tuple(str(labels.get(k, "")) for k in self.labels)
+        with self._lock:
+            self._values[key] = value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labels, key)} {value}")
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values) -> str:
+    if not names:
+        return ""
+    pairs = (f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + ",".join(pairs) + "}"
+
+
+# ---------------- REGISTRY ----------------
+http_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "path", "status"]
+)
+stage_seconds = Histogram(
+    "pipeline_stage_duration_seconds", "Latency of each /chat pipeline stage", ["stage"]
+)
+stage_errors = Counter(
+    "pipeline_stage_errors_total", "Failures raised inside a pipeline stage", ["stage", "error"]
+)
+chat_failures = Counter(
+    "chat_failures_total", "/chat requests answered with the error fallback", ["error"]
+)
+upstream_seconds = Histogram(
+    "upstream_request_duration_seconds", "Yahoo Finance call latency", ["call", "status"]
+)
+upstream_requests = Counter(
+    "upstream_requests_total", "Yahoo Finance calls by outcome", ["call", "status"]
+)
+
+startup_seconds = Gauge(
+    "startup_phase_seconds", "Time spent in each cold-start phase and lazy import", ["phase"]
+)
+
+REGISTRY = [
+    http_seconds, stage_seconds, stage_errors, chat_failures, upstream_seconds, upstream_requests,
+    startup_seconds,
+]
+
+
+def render() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ---------------- REQUEST TIMINGS ----------------
+# Per-request list of (stage, seconds) used for the Server-Timing header
+_timings = contextvars.ContextVar("timings", default=None)
+
+
+def begin_request() -> list:
+    timings = []
+    _timings.set(timings)
+    return timings
+
+
+def record_stage(stage: str, seconds: float, error: Exception = None):
+    stage_seconds.observe(seconds, stage=stage)
+    if error is not None:
+        stage_errors.inc(stage=stage, error=type(error).__name__)
+    timings = _timings.get()
+    if timings is not None:
+        timings.append((stage, seconds))
+
+
+@contextmanager
+def timed(stage: str):
+    t0 = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        record_stage(stage, time.perf_counter() - t0, e)
+        raise
+    record_stage(stage, time.perf_counter() - t0)
+
+
+def server_timing(timings, total: float) -> str:
+    parts = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings]
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+# ---------------- UPSTREAM ----------------
+def upstream_status(error: Exception) -> str:
+    text = f"{type(error).__name__} {error}".lower()
+    if "ratelimit" in text or "too many requests" in text or "429" in text:
+        return "rate_limited"
+    if "timed out" in text or "timeout" in text:
+        return "timeout"
+    if isinstance(error, ConnectionError) or "connection" in text:
+        return "connection"
+    return "error"
+
+
+def observe_upstream(call: str, fn, *args, **kwargs):
+    # Times one yfinance call and labels it ok / empty / rate_limited / timeout / connection / error
+    t0 = time.perf_counter()
+    try:
+        result = fn(*args, **kwargs)
+    except Exception as e:
+        status = upstream_status(e)
+        upstream_seconds.observe(time.perf_counter() - t0, call=call, status=status)
+        upstream_requests.inc(call=call, status=status)
+        raise
+    status = "empty" if result is None or getattr(result, "empty", False) else "ok"
+    upstream_seconds.observe(time.perf_counter() - t0, call=call, status=status)
+    upstream_requests.inc(call=call, status=status)
+    return result
@@ -0,0 +1,392 @@
+# predictors.py
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+STATE_FILE = os.getenv("MODEL_STATE_FILE", os.path.join("model_state", "predictors.json"))
+SAVE_INTERVAL = float(os.getenv("MODEL_SAVE_INTERVAL", "60"))
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# Bump whenever a model's maths changes so cached answers and ETags expire
+MODEL_VERSION = "1"
+
+
+# ---------------- MODELS ----------------
+# update(close) folds one closed bar into the state in O(1);
+# forecast() returns (next_price, confidence 0-100);
+# peek(close) is forecast() as if close had been folded in, without
+# mutating anything (used for the still-forming latest bar).
+
+class _ErrorTracker:
+    # Running one-step-ahead error vs. the variance of the target, giving an
+    # out-of-sample R² that every model reports as its confidence.
+    __slots__ = ("decay", "sse", "sst", "mean", "n")
+
+    def __init__(self, decay: float = 0.98):
+        self.decay = decay
+        self.sse = self.sst = self.mean = 0.0
+        self.n = 0
+
+    def _next(self, predicted, actual):
+        d = self.decay
+        mean = actual if self.n == 0 else d * self.mean + (1 - d) * actual
+        return d * self.sse + (predicted - actual) ** 2, d * self.sst + (actual - mean) ** 2, mean, self.n + 1
+
+    def add(self, predicted, actual):
+        if predicted is None:
+            return
+        self.sse, self.sst, self.mean, self.n = self._next(predicted, actual)
+
+    def peek(self, predicted, actual) -> float:
+        if predicted is None:
+            return self.confidence()
+        sse, sst, _, n = self._next(predicted, actual)
+        return self._confidence(sse, sst, n)
+
+    @staticmethod
+    def _confidence(sse, sst, n) -> float:
+        if n < 5 or sst <= 0:
+            return 0.0
+        return max(0.0, 1.0 - sse / sst) * 100
+
+    def confidence(self) -> float:
+        return self._confidence(self.sse, self.sst, self.n)
+
+    def state(self):
+        return [self.sse, self.sst, self.mean, self.n]
+
+    def load(self, s):
+        self.sse, self.sst, self.mean, self.n = s
+
+
+class LinearTrend:
+    # Least-squares line over a sliding window of closes (same fit as
+    # Predictor.predict), with the window sums shifted in O(1).
+    name = "linear"
+
+    def __init__(self, window: int = 126):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.sy = self.sxy = self.syy = 0.0
+
+    def update(self, close: float):
+        if len(self.values) == self.window:
+            old = self.values[0]
+            # Every remaining value moves one position to the left
+            self.sxy -= self.sy - old
+            self.sy -= old
+            self.syy -= old * old
+        self.sxy += min(len(self.values), self.window - 1) * close
+        self.values.append(close)
+        self.sy += close
+        self.syy += close * close
+
+    @staticmethod
+    def _fit(n, sy, sxy, syy):
+        if n < 10:
+            return 0.0, 0.0
+        x_mean = (n - 1) / 2.0
+        sxx = n * (n * n - 1) / 12.0
+        sxy_c = sxy - x_mean * sy
+        syy_c = syy - sy * sy / n
+        slope = sxy_c / sxx
+        intercept = sy / n - slope * x_mean
+        r2 = slope * sxy_c / syy_c if syy_c > 0 else 1.0
+        return intercept + slope * n, r2 * 100
+
+    def forecast(self):
+        return self._fit(len(self.values), self.sy, self.sxy, self.syy)
+
+    def peek(self, close: float):
+        # The same shift as update(), on local copies of the three sums
+        n, sy, sxy, syy = len(self.values), self.sy, self.sxy, self.syy
+        if n == self.window:
+            old = self.values[0]
+            sxy -= sy - old
+            sy -= old
+            syy -= old * old
+        sxy += min(n, self.window - 1) * close
+        return self._fit(min(n + 1, self.window), sy + close, sxy, syy + close * close)
+
+    def state(self):
+        return {"window": self.window, "values": list(self.values)}
+
+    @classmethod
+    def restore(cls, s):
+        m = cls(s["window"])
+        for v in s["values"]:
+            m.update(v)
+        return m
+
+
+class _LaggedReturns:
+    # Shared plumbing for models that regress the next return on the last p
+    def __init__(self, lags: int):
+        self.lags = lags
+        self.returns = deque(maxlen=lags)
+        self.last = None
+        self.errors = _ErrorTracker()
+
+    def _features(self):
+        return np.array([1.0, *reversed(self.returns)])
+
+    def update(self, close: float):
+        if self.last:
+            r = close / self.last - 1.0
+            if len(self.returns) == self.lags:
+                x = self._features()
+                self.errors.add(self.last * (1 + float(x @ self._coef())), close)
+                self._learn(x, r)
+            self.returns.append(r)
+        self.last = close
+
+    def forecast(self):
+        if not self.last or len(self.returns) < self.lags:
+            return 0.0, 0.0
+        r = float(self._features() @ self._coef())
+        return self.last * (1 + r), self.errors.confidence()
+
+    def peek(self, close: float):
+        if not self.last:
+            return 0.0, 0.0
+        r = close / self.last - 1.0
+        coef, confidence = self._coef(), self.errors.confidence()
+        if len(self.returns) == self.lags:
+            x = self._features()
+            confidence = self.errors.peek(self.last * (1 + float(x @ coef)), close)
+            coef = self._coef_with(x, r)
+        returns = [*self.returns, r][-self.lags:]
+        if len(returns) < self.lags:
+            return 0.0, 0.0
+        return close * (1 + float(np.array([1.0, *reversed(returns)]) @ coef)), confidence
+
+
+class RidgeLagged(_LaggedReturns):
+    # Ridge regression on lagged returns from running sufficient statistics
+    # (XᵀX and Xᵀy); each bar costs O(p²), the p×p solve is constant size.
+    name = "ridge"
+
+    def __init__(self, lags: int = 5, alpha: float = 1e-4):
+        super().__init__(lags)
+        self.alpha = alpha
+        self.xtx = np.zeros((lags + 1, lags + 1))
+        self.xty = np.zeros(lags + 1)
+
+    def _learn(self, x, r):
+        self.xtx += np.outer(x, x)
+        self.xty += x * r
+
+    def _solve(self, xtx, xty):
+        penalty = self.alpha * np.eye(self.lags + 1)
+        penalty[0, 0] = 0.0  # never shrink the intercept
+        try:
+            return np.linalg.solve(xtx + penalty, xty)
+        except np.linalg.LinAlgError:
+            return np.zeros(self.lags + 1)
+
+    def _coef(self):
+        return self._solve(self.xtx, self.xty)
+
+    def _coef_with(self, x, r):
+        return self._solve(self.xtx + np.outer(x, x), self.xty + x * r)
+
+    def state(self):
+        return {
+            "lags": self.lags, "alpha": self.alpha, "returns": list(self.returns), "last": self.last,
+            "xtx": self.xtx.tolist(), "xty": self.xty.tolist(), "errors": self.errors.state(),
+        }
+
+    @classmethod
+    def restore(cls, s):
+        m = cls(s["lags"], s["alpha"])
+        m.returns.extend(s["returns"])
+        m.last = s["last"]
+        m.xtx = np.array(s["xtx"])
+        m.xty = np.array(s["xty"])
+        m.errors.load(s["errors"])
+        return m
+
+
+class RecursiveLS(_LaggedReturns):
+    # Recursive least squares with exponential forgetting on lagged returns
+    name = "rls"
+
+    def __init__(self, lags: int = 5, forgetting: float = 0.99, delta: float = 100.0):
+        super().__init__(lags)
+        self.forgetting = forgetting
+        self.coef = np.zeros(lags + 1)
+        self.p = np.eye(lags + 1) * delta
+
+    def _coef(self):
+        return self.coef
+
+    def _gain(self, x):
+        px = self.p @ x
+        return px, px / (self.forgetting + x @ px)
+
+    def _learn(self, x, r):
+        px, gain = self._gain(x)
+        self.coef = self.coef + gain * (r - x @ self.coef)
+        self.p = (self.p - np.outer(gain, px)) / self.forgetting
+
+    def _coef_with(self, x, r):
+        _, gain = self._gain(x)
+        return self.coef + gain * (r - x @ self.coef)
+
+    def state(self):
+        return {
+            "lags": self.lags, "forgetting": self.forgetting, "returns": list(self.returns),
+            "last": self.last, "coef": self.coef.tolist(), "p": self.p.tolist(),
+            "errors": self.errors.state(),
+        }
+
+    @classmethod
+    def restore(cls, s):
+        m = cls(s["lags"], s["forgetting"])
+        m.returns.extend(s["returns"])
+        m.last = s["last"]
+        m.coef = np.array(s["coef"])
+        m.p = np.array(s["p"])
+        m.errors.load(s["errors"])
+        return m
+
+
+class HoltWinters:
+    # Holt's additive-trend exponential smoothing. Daily closes have no
+    # stable seasonal cycle, so the seasonal component is left out.
+    name = "holt"
+
+    def __init__(self, alpha: float = 0.5, beta: float = 0.1):
+        self.alpha = alpha
+        self.beta = beta
+        self.level = None
+        self.trend = 0.0
+        self.errors = _ErrorTracker()
+
+    def update(self, close: float):
+        if self.level is None:
+            self.level = close
+            return
+        self.errors.add(self.level + self.trend, close)
+        previous = self.level
+        self.level = self.alpha * close + (1 - self.alpha) * (self.level + self.trend)
+        self.trend = self.beta * (self.level - previous) + (1 - self.beta) * self.trend
+
+    def forecast(self):
+        if self.level is None:
+            return 0.0, 0.0
+        return self.level + self.trend, self.errors.confidence()
+
+    def peek(self, close: float):
+        if self.level is None:
+            return close, self.errors.confidence()
+        confidence = self.errors.peek(self.level + self.trend, close)
+        level = self.alpha * close + (1 - self.alpha) * (self.level + self.trend)
+        trend = self.beta * (level - self.level) + (1 - self.beta) * self.trend
+        return level + trend, confidence
+
+    def state(self):
+        return {"alpha": self.alpha, "beta": self.beta, "level": self.level,
+                "trend": self.trend, "errors": self.errors.state()}
+
+    @classmethod
+    def restore(cls, s):
+        m = cls(s["alpha"], s["beta"])
+        m.level, m.trend = s["level"], s["trend"]
+        m.errors.load(s["errors"])
+        return m
+
+
+MODELS = {cls.name: cls for cls in (LinearTrend, RidgeLagged, HoltWinters, RecursiveLS)}
+
+
+# ---------------- REGISTRY ----------------
+class PredictorRegistry:
+    def __init__(self, path: str = STATE_FILE):
+        self.path = path
+        self._models = {}  # (model, symbol, interval) -> [model, last committed bar time (ns)]
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._saved = time.monotonic()
+
+    def predict(self, name: str, symbol: str, bars, interval: str = "1d"):
+        if name not in MODELS:
+            raise ValueError(f"Unknown model '{name}', choose from {', '.join(MODELS)}")
+        if bars is None or len(bars) < 10:
+            return 0.0, 0.0
+
+        ts, close = bars.ts, bars.close
+        key = (name, symbol, interval)
+
+        with self._lock:
+            entry = self._models.get(key)
+            start = 0
+            if entry is not None:
+                pos = int(np.searchsorted(ts, entry[1]))
+                if pos < len(ts) - 1 and ts[pos] == entry[1]:
+                    start = pos + 1
+                else:
+                    entry = None
+            if entry is None:
+                entry = self._models[key] = [MODELS[name](), None]
+
+            # Closed bars are folded in once; the newest bar may still be
+            # forming, so it is only peeked.
+            model = entry[0]
+            for i in range(start, len(ts) - 1):
+                model.update(close[i])
+            if start < len(ts) - 1:
+                entry[1] = int(ts[-2])
+                self._dirty = True
+
+            next_price, confidence = model.peek(close[-1])
+
+        if not math.isfinite(next_price) or not math.isfinite(confidence):
+            return 0.0, 0.0
+        return float(next_price), float(confidence)
+
+    # ---------- PERSISTENCE ----------
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            doc = [
+                {"model": k[0], "symbol": k[1], "interval": k[2],
+                 "last_ts": (EPOCH + timedelta(microseconds=v[1] // 1000)).isoformat(), "state": v[0].state()}
+                for k, v in self._models.items() if v[1] is not None
+            ]
+            self._dirty = False
+            self._saved = time.monotonic()
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(doc, f)
+        os.replace(tmp, self.path)
+
+    def save_due(self) -> bool:
+        return self._dirty and time.monotonic() - self._saved > SAVE_INTERVAL
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                doc = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        with self._lock:
+            for item in doc:
+                cls = MODELS.get(item["model"])
+                if cls is None:
+                    continue
+                self._models[(item["model"], item["symbol"], item["interval"])] = [
+                    cls.restore(item["state"]),
+                    (datetime.fromisoformat(item["last_ts"]) - EPOCH) // timedelta(microseconds=1) * 1000,
+                ]
+
+
+predictor_registry = PredictorRegistry()
@@ -0,0 +1,116 @@
+# scheduler.py
+import asyncio
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import markets
+
+LEAD_MINUTES = float(os.getenv("PREFETCH_LEAD_MINUTES", "10"))
+AFTER_CLOSE_MINUTES = float(os.getenv("PREFETCH_AFTER_CLOSE_MINUTES", "20"))
+CONCURRENCY = int(os.getenv("PREFETCH_CONCURRENCY", "4"))
+JITTER_SECONDS = float(os.getenv("PREFETCH_JITTER", "2"))
+
+
+# ---------------- SCHEDULER ----------------
+class PrefetchScheduler:
+    # universe() -> list of symbols; warm(symbol) is a coroutine that
+    # fetches bars and pre-computes the forecast for one symbol.
+    def __init__(self, universe, warm, concurrency: int = CONCURRENCY, jitter: float = JITTER_SECONDS):
+        self.universe = universe
+        self.warm = warm
+        self.concurrency = concurrency
+        self.jitter = jitter
+        self._task = None
+        self.last_runs = {}
+
+    def groups(self) -> dict:
+        by_market = {}
+        for symbol in self.universe():
+            by_market.setdefault(markets.market_for(symbol), []).append(symbol)
+        return by_market
+
+    def upcoming(self, now: datetime = None) -> list:
+        # (when, market, reason) for every market's next pre-open and post-close run
+        now = now or datetime.now(timezone.utc)
+        events = []
+        for market in self.groups():
+            pre_open = markets.next_open(market, now + timedelta(minutes=LEAD_MINUTES))
+            events.append((pre_open - timedelta(minutes=LEAD_MINUTES), market, "pre-open"))
+            post_close = markets.next_close(market, now - timedelta(minutes=AFTER_CLOSE_MINUTES))
+            events.append((post_close + timedelta(minutes=AFTER_CLOSE_MINUTES), market, "post-close"))
+        return sorted(events, key=lambda e: e[0])
+
+    def next_due(self, since: datetime):
+        # (when, [(market, reason), ...]) for the earliest run after since,
+        # with every market sharing that time (NSE/BSE, the CET exchanges...)
+        events = self.upcoming(since)
+        if not events:
+            return None, []
+        when = events[0][0]
+        return when, [(market, reason) for w, market, reason in events if w <= when]
+
+    async def run_market(self, market, reason: str = "manual") -> dict:
+        symbols = self.groups().get(market, [])
+        slots = asyncio.Semaphore(self.concurrency)
+        ok, failed = 0, 0
+        started = time.perf_counter()
+
+        async def one(symbol):
+            nonlocal ok, failed
+            async with slots:
+                # Spread requests out to stay under upstream rate limits
+                await asyncio.sleep(random.uniform(0, self.jitter))
+                try:
+                    await self.warm(symbol)
+                    ok += 1
+                except Exception:
+                    failed += 1
+
+        await asyncio.gather(*(one(s) for s in symbols))
+
+        summary = {
+            "reason": reason,
+            "finished": datetime.now(timezone.utc).isoformat(),
+            "symbols": len(symbols),
+            "ok": ok,
+            "failed": failed,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+        self.last_runs[market.name] = summary
+        return summary
+
+    async def _loop(self):
+        # Events are looked up from the last one handled, not from the clock,
+        # so runs that fell due while another was in progress still happen
+        since = datetime.now(timezone.utc)
+        while True:
+            when, due = self.next_due(since)
+            if when is None:
+                return
+            delay = (when - datetime.now(timezone.utc)).total_seconds()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            for market, reason in due:
+                await self.run_market(market, reason)
+            since = when + timedelta(seconds=1)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def status(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "upcoming": [
+                {"when": when.astimezone(timezone.utc).isoformat(), "market": market.name, "reason": reason}
+                for when, market, reason in self.upcoming()[:10]
+            ],
+            "last_runs": self.last_runs,
+        }
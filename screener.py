@@ -0,0 +1,132 @@
+# screener.py
+import operator
+import re
+import threading
+import time
+
+import numpy as np
+
+import analytics
+from indicators import indicator_engine
+
+COLUMNS = (
+    "price", "volatility", "predicted", "upside", "confidence",
+    "sma_20", "ema_20", "rsi_14", "macd", "macd_signal", "macd_hist", "atr_14", "volatility_20",
+)
+
+OPS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+       "==": operator.eq, "=": operator.eq, "!=": operator.ne}
+CLAUSE = re.compile(r"^\s*([a-z_0-9]+)\s*(<=|>=|==|!=|<|>|=)\s*(-?\d+(?:\.\d*)?(?:e-?\d+)?)\s*$", re.I)
+
+
+def parse_filter(expression: str):
+    # "upside > 2 and volatility < 0.3" -> [(column, op, value), ...]
+    clauses = []
+    for part in re.split(r"\s+and\s+|,", expression or "", flags=re.I):
+        if not part.strip():
+            continue
+        m = CLAUSE.match(part)
+        if not m:
+            raise ValueError(f"Cannot parse filter clause '{part.strip()}'")
+        column, op, value = m.group(1).lower(), m.group(2), float(m.group(3))
+        if column not in COLUMNS:
+            raise ValueError(f"Unknown column '{column}', choose from {', '.join(COLUMNS)}")
+        clauses.append((column, OPS[op], value))
+    return clauses
+
+
+# ---------------- SNAPSHOT ----------------
+class Snapshot:
+    # One row per symbol, one contiguous float array per column, so a
+    # screen is a handful of vectorized comparisons over the whole universe.
+    def __init__(self, period: str = "6mo", interval: str = "1d", capacity: int = 512):
+        # Rows are computed from this series only (/chat's default bars)
+        self.period, self.interval = period, interval
+        self.symbols = []
+        self.rows = {}
+        self.capacity = capacity
+        self.columns = {c: np.full(capacity, np.nan) for c in COLUMNS}
+        self.updated = np.zeros(capacity)
+        self._bars = {}  # symbol -> (last bar time, last close)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def _row(self, symbol: str) -> int:
+        row = self.rows.get(symbol)
+        if row is None:
+            row = len(self.symbols)
+            if row == self.capacity:
+                self.capacity *= 2
+                for c, values in self.columns.items():
+                    grown = np.full(self.capacity, np.nan)
+                    grown[:row] = values
+                    self.columns[c] = grown
+                self.updated = np.concatenate((self.updated, np.zeros(self.capacity - row)))
+            self.rows[symbol] = row
+            self.symbols.append(symbol)
+        return row
+
+    def update(self, symbol: str, bars, period: str = None, interval: str = None) -> bool:
+        # Recomputes the row only when the newest bar changed
+        if (period or self.period, interval or self.interval) != (self.period, self.interval):
+            return False
+        if bars is None or not len(bars):
+            return False
+        close = bars.close
+        marker = (int(bars.ts[-1]), close[-1])
+        if self._bars.get(symbol) == marker:
+            return False
+
+        predicted, confidence, _ = analytics.trend_forecast(close)
+        values = {
+            "price": close[-1],
+            "volatility": analytics.annualized_volatility(close[:, None])[0],
+            "predicted": predicted,
+            "upside": (predicted / close[-1] - 1) * 100 if predicted and close[-1] else np.nan,
+            "confidence": confidence,
+        }
+        values.update(indicator_engine.update(symbol, bars))
+
+        with self._lock:
+            row = self._row(symbol)
+            for c in COLUMNS:
+                v = values.get(c)
+                self.columns[c][row] = np.nan if v is None else float(v)
+            self.updated[row] = time.time()
+            self._bars[symbol] = marker
+        return True
+
+    def screen(self, where: str = "", sort: str = "upside", k: int = 20, descending: bool = True) -> dict:
+        if sort not in COLUMNS:
+            raise ValueError(f"Unknown sort column '{sort}', choose from {', '.join(COLUMNS)}")
+        clauses = parse_filter(where)
+
+        with self._lock:
+            n = len(self.symbols)
+            cols = {c: v[:n] for c, v in self.columns.items()}
+            key = cols[sort]
+            mask = ~np.isnan(cols["price"]) & ~np.isnan(key)
+            for column, op, value in clauses:
+                with np.errstate(invalid="ignore"):
+                    mask &= op(cols[column], value)
+
+            candidates = np.flatnonzero(mask)
+            scores = -key[candidates] if descending else key[candidates]
+            if k < candidates.size:
+                # O(n) selection of the k best, then sort only those k
+                top = np.argpartition(scores, k - 1)[:k]
+                candidates, scores = candidates[top], scores[top]
+            ranked = candidates[np.argsort(scores, kind="stable")]
+
+            results = [
+                {"stock": self.symbols[i],
+                 **{c: None if np.isnan(cols[c][i]) else float(cols[c][i]) for c in COLUMNS},
+                 "updated": float(self.updated[i])}
+                for i in ranked
+            ]
+        return {"rows": n, "matched": int(mask.sum()), "results": results}
+
+
+universe_snapshot = Snapshot()
@@ -0,0 +1,205 @@
+# shared_bars.py
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from bars import BarSeries
+
+try:
+    import fcntl
+except ImportError:
+    # No flock (Windows): only threads of this process are coordinated
+    fcntl = None
+
+COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+# Bars published during an upstream outage expire this soon, whatever the
+# caller's TTL, so some worker retries upstream shortly after it recovers
+STALE_TTL = float(os.getenv("STALE_BAR_TTL", "30"))
+
+
+def _default_dir() -> str:
+    # tmpfs keeps the arrays in RAM and shared between every worker
+    root = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(root, "stock-bars")
+
+
+# ---------------- SHARED STORE ----------------
+class SharedBarStore:
+    # Bars of every (symbol, period, interval) live in one .npy file each,
+    # a (1 + len(COLUMNS)) x bars float64 array whose first row is the bar
+    # time in epoch seconds. Workers np.load them with mmap_mode="r", so all
+    # processes map the same pages instead of holding their own copies.
+    #
+    # index.json maps each key to its current file, refresh time and tz.
+    # Refreshing a key takes an exclusive flock on that key's lock file;
+    # workers that lose the race wait and then read what the winner wrote.
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(os.path.join(root, "locks"), exist_ok=True)
+        self._index_path = os.path.join(root, "index.json")
+        self._index = {}
+        self._index_signature = None
+        self._guard = threading.Lock()
+        self._thread_locks = {}
+        self._hits = self._refreshes = self._waits = 0
+
+    @staticmethod
+    def _name(key) -> str:
+        return re.sub(r"[^A-Za-z0-9._-]", "_", "~".join(str(k) for k in key))
+
+    # ---------- LOCKING ----------
+    @contextmanager
+    def _flock(self, name: str):
+        with self._guard:
+            local = self._thread_locks.setdefault(name, threading.Lock())
+        with local:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.root, "locks", f"{name}.lock"), "a") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    # ---------- INDEX ----------
+    def _read_index(self) -> dict:
+        # Re-parsed only when another worker has replaced the file
+        try:
+            st = os.stat(self._index_path)
+        except FileNotFoundError:
+            return {}
+        # os.replace gives every version a new inode, even within one mtime tick
+        signature = (st.st_ino, st.st_mtime_ns)
+        with self._guard:
+            if signature != self._index_signature:
+                try:
+                    with open(self._index_path) as f:
+                        self._index = json.load(f)
+                    self._index_signature = signature
+                except (FileNotFoundError, ValueError):
+                    pass
+            return self._index
+
+    def _publish(self, name: str, entry: dict):
+        with self._flock("index"):
+            index = dict(self._read_index())
+            previous = index.get(name)
+            index[name] = entry
+            tmp = f"{self._index_path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(index, f)
+            os.replace(tmp, self._index_path)
+
+        if previous and previous["file"] != entry["file"]:
+            # Readers that still map the old file keep it alive until they drop it
+            try:
+                os.remove(os.path.join(self.root, previous["file"]))
+            except OSError:
+                pass
+
+    # ---------- DATA ----------
+    def _read(self, entry: dict):
+        try:
+            data = np.load(os.path.join(self.root, entry["file"]), mmap_mode="r")
+        except (FileNotFoundError, ValueError):
+            return None
+        # Each OHLCV row is contiguous, so the columns are views onto the mapping
+        return BarSeries(
+            data[0].astype(np.int64) * 1_000_000_000,
+            data[1], data[2], data[3], data[4], data[5],
+            entry.get("tz"), entry.get("stale", False),
+        )
+
+    def _write(self, name: str, bars: BarSeries) -> dict:
+        data = np.empty((1 + len(COLUMNS), len(bars)))
+        data[0] = bars.ts // 1_000_000_000
+        for i, column in enumerate((bars.open, bars.high, bars.low, bars.close, bars.volume), start=1):
+            data[i] = column
+
+        file = f"{name}.{time.time_ns()}.{os.getpid()}.npy"
+        tmp = os.path.join(self.root, f"{file}.tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, data)
+        os.replace(tmp, os.path.join(self.root, file))
+
+        entry = {
+            "file": file, "updated": time.time(), "bars": len(bars), "tz": bars.tz,
+            "stale": bool(bars.stale),
+        }
+        self._publish(name, entry)
+        return entry
+
+    def _fresh(self, name: str, ttl: float):
+        entry = self._read_index().get(name)
+        if entry is not None and entry.get("stale"):
+            ttl = min(ttl, STALE_TTL)
+        if entry is None or time.time() - entry["updated"] > ttl:
+            return None
+        return self._read(entry)
+
+    # ---------- API ----------
+    def get(self, key, ttl: float):
+        bars = self._fresh(self._name(key), ttl)
+        if bars is not None:
+            self._hits += 1
+        return bars
+
+    def put(self, key, bars: BarSeries):
+        name = self._name(key)
+        with self._flock(name):
+            self._write(name, bars)
+
+    def load(self, key, loader, ttl: float):
+        # loader() -> BarSeries; called by at most one worker per key at a time
+        name = self._name(key)
+        bars = self._fresh(name, ttl)
+        if bars is not None:
+            self._hits += 1
+            return bars
+
+        with self._flock(name):
+            # Another worker may have refreshed the key while we waited
+            bars = self._fresh(name, ttl)
+            if bars is not None:
+                self._waits += 1
+                return bars
+
+            fetched = loader()
+            if fetched is None or not len(fetched):
+                return fetched
+            entry = self._write(name, fetched)
+            self._refreshes += 1
+        return self._read(entry)
+
+    def stats(self) -> dict:
+        index = self._read_index()
+        size = 0
+        for entry in index.values():
+            try:
+                size += os.path.getsize(os.path.join(self.root, entry["file"]))
+            except OSError:
+                pass
+        return {
+            "root": self.root,
+            "keys": len(index),
+            "bytes": size,
+            "hits": self._hits,
+            "waited_for_other_worker": self._waits,
+            "refreshes": self._refreshes,
+            "pid": os.getpid(),
+        }
+
+
+# ---------------- SHARED INSTANCES ----------------
+shared_bars = None
+if os.getenv("SHARED_BARS", "0") == "1":
+    shared_bars = SharedBarStore(os.getenv("SHARED_BARS_DIR", _default_dir()))
@@ -0,0 +1,101 @@
+# streaming.py
+import asyncio
+import os
+import time
+
+POLL_INTERVAL = float(os.getenv("STREAM_POLL_INTERVAL", "15"))
+QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", "32"))
+
+
+# ---------------- SUBSCRIBER ----------------
+class Subscriber:
+    def __init__(self, maxsize: int = QUEUE_SIZE):
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.symbols = set()
+        self.dropped = 0
+
+    def offer(self, item: dict):
+        # Slow consumer: drop the oldest pending update rather than block
+        # the poller or grow without bound.
+        if self.queue.full():
+            try:
+                self.queue.get_nowait()
+                self.dropped += 1
+            except asyncio.QueueEmpty:
+                pass
+        self.queue.put_nowait(item)
+
+    async def get(self) -> dict:
+        return await self.queue.get()
+
+
+# ---------------- HUB ----------------
+class _Topic:
+    __slots__ = ("subscribers", "task", "last")
+
+    def __init__(self):
+        self.subscribers = set()
+        self.task = None
+        self.last = None
+
+
+class PriceHub:
+    # One poller task per distinct symbol, fanned out to every subscriber.
+    # load(symbol) is a coroutine returning a snapshot dict.
+    def __init__(self, load, interval: float = POLL_INTERVAL):
+        self.load = load
+        self.interval = interval
+        self._topics = {}
+
+    def subscribe(self, symbol: str, sub: Subscriber):
+        topic = self._topics.get(symbol)
+        if topic is None:
+            topic = self._topics[symbol] = _Topic()
+        topic.subscribers.add(sub)
+        sub.symbols.add(symbol)
+
+        if topic.last is not None:
+            sub.offer(topic.last)
+        if topic.task is None:
+            topic.task = asyncio.create_task(self._poll(symbol, topic))
+
+    def unsubscribe(self, symbol: str, sub: Subscriber):
+        sub.symbols.discard(symbol)
+        topic = self._topics.get(symbol)
+        if topic is None:
+            return
+        topic.subscribers.discard(sub)
+        if not topic.subscribers:
+            if topic.task is not None:
+                topic.task.cancel()
+            del self._topics[symbol]
+
+    def close(self, sub: Subscriber):
+        for symbol in list(sub.symbols):
+            self.unsubscribe(symbol, sub)
+
+    async def _poll(self, symbol: str, topic: _Topic):
+        while topic.subscribers:
+            try:
+                snapshot = await self.load(symbol)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                snapshot = {"stock": symbol, "error": str(e)}
+
+            changed = topic.last is None or any(
+                snapshot.get(k) != topic.last.get(k) for k in snapshot if k != "timestamp"
+            )
+            if changed:
+                snapshot.setdefault("timestamp", time.time())
+                topic.last = snapshot
+                for sub in list(topic.subscribers):
+                    sub.offer(snapshot)
+
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> dict:
+        return {
+            "symbols": len(self._topics),
+            "subscriptions": sum(len(t.subscribers) for t in self._topics.values()),
+        }
@@ -0,0 +1,78 @@
+# test_intents.py
+import pytest
+
+from intents import Automaton, IntentEngine, intent_engine
+
+
+# ---------------- AUTOMATON ----------------
+def matcher(*patterns):
+    automaton = Automaton()
+    for p in patterns:
+        automaton.add(p, p)
+    return automaton.build()
+
+
+def test_automaton_prefers_leftmost_longest():
+    assert matcher("buy", "buy back", "back").find("buy back now") == ["buy back"]
+
+
+def test_automaton_respects_word_boundaries():
+    assert matcher("buy").find("buyer buys, buy!") == ["buy"]
+
+
+def test_automaton_finds_every_pattern_in_one_pass():
+    assert matcher("he", "she", "hers").find("she said hers") == ["she", "hers"]
+
+
+# ---------------- NAME FORMS ----------------
+@pytest.mark.parametrize("name, expected", [
+    ("Amazon.com Inc.", {"amazon", "amazon.com"}),
+    ("Alphabet Inc. (Class A)", {"alphabet", "alphabet inc"}),
+    ("Siemens AG (Germany)", {"siemens", "siemens ag"}),
+    ("Reliance Industries (BSE)", {"reliance industries"}),
+    ("AT&T Inc.", {"at&t"}),
+])
+def test_name_forms(name, expected):
+    forms = IntentEngine._name_forms(name)
+    assert expected <= forms
+    assert not any("(" in f or ")" in f for f in forms)
+
+
+def test_ambiguous_short_names_are_not_added():
+    assert "block" not in IntentEngine._name_forms("Block Inc.")
+    assert "trip" not in IntentEngine._name_forms("Trip.com Group")
+    assert "booking" not in IntentEngine._name_forms("Booking Holdings")
+    assert "sea" not in IntentEngine._name_forms("Sea Limited")
+
+
+# ---------------- PARSE ----------------
+@pytest.mark.parametrize("question, symbols", [
+    ("buy amazon", ("AMZN",)),
+    ("amazon.com trend", ("AMZN",)),
+    ("alphabet outlook", ("GOOGL",)),
+    ("siemens trend", ("SIEGY",)),
+    ("is berkshire hathaway a buy", ("BRK-B",)),
+    ("should I buy reliance industries", ("RELIANCE.NS",)),
+    ("compare tcs and infosys", ("TCS.NS", "INFY.NS")),
+    ("what about $T", ("T",)),
+    ("plan a trip to the shell beach", ()),
+    ("should I be booking profits", ()),
+    ("is the southern market doing better", ()),
+    ("sea of red today", ()),
+    ("snap decision to sell?", ()),
+    ("give me a lucid answer", ()),
+    ("booking holdings trend", ("BKNG",)),
+    ("buy southern company", ("SO",)),
+])
+def test_parse_symbols(question, symbols):
+    assert intent_engine.parse(question).symbols == symbols
+
+
+@pytest.mark.parametrize("question, intent", [
+    ("should I buy AAPL", "buy"),
+    ("time to sell tesla?", "sell"),
+    ("what is the trend for infosys", "trend"),
+    ("apple buyback news", "general"),
+])
+def test_parse_intent(question, intent):
+    assert intent_engine.parse(question).intent == intent
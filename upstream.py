@@ -0,0 +1,155 @@
+# upstream.py
+import os
+import random
+import threading
+import time
+
+import metrics
+
+RATE = float(os.getenv("UPSTREAM_RATE", "5"))            # calls per second
+BURST = int(os.getenv("UPSTREAM_BURST", "10"))
+MAX_WAIT = float(os.getenv("UPSTREAM_MAX_WAIT", "10"))   # seconds to queue for a token
+RETRIES = int(os.getenv("UPSTREAM_RETRIES", "3"))
+BACKOFF = float(os.getenv("UPSTREAM_BACKOFF", "0.5"))
+BACKOFF_MAX = float(os.getenv("UPSTREAM_BACKOFF_MAX", "8"))
+BREAKER_FAILURES = int(os.getenv("BREAKER_FAILURES", "5"))
+BREAKER_RESET = float(os.getenv("BREAKER_RESET", "30"))
+
+# Failures worth another attempt; anything else will fail the same way again
+RETRYABLE = {"rate_limited", "timeout", "connection"}
+
+
+class UpstreamUnavailable(Exception):
+    pass
+
+
+# ---------------- RATE LIMIT ----------------
+class TokenBucket:
+    def __init__(self, rate: float = RATE, burst: int = BURST):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait: float = MAX_WAIT):
+        # Blocks the calling I/O thread until a token is free
+        deadline = time.monotonic() + max_wait
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            if now + wait > deadline:
+                raise UpstreamUnavailable("Local rate limit: too many upstream requests queued")
+            time.sleep(wait)
+
+
+# ---------------- CIRCUIT BREAKER ----------------
+class CircuitBreaker:
+    # closed: calls flow; open: calls fail fast until reset_after has passed;
+    # half-open: one probe call decides whether to close or re-open.
+    def __init__(self, failures: int = BREAKER_FAILURES, reset_after: float = BREAKER_RESET):
+        self.threshold = failures
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_after:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def release(self):
+        # The call says nothing about upstream health (never sent, or failed
+        # on its own input); free the probe slot without counting it
+        with self._lock:
+            self.probing = False
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.probing or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+
+# ---------------- CLIENT ----------------
+class UpstreamClient:
+    def __init__(self, bucket: TokenBucket = None, breaker: CircuitBreaker = None,
+                 retries: int = RETRIES, backoff: float = BACKOFF, backoff_max: float = BACKOFF_MAX):
+        self.bucket = bucket or TokenBucket()
+        self.breaker = breaker or CircuitBreaker()
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+
+    @property
+    def healthy(self) -> bool:
+        return self.breaker.state == "closed"
+
+    def call(self, name: str, fn, *args, **kwargs):
+        # Every yfinance call goes through here: rate limited, transient
+        # errors retried with full-jitter exponential backoff, and
+        # short-circuited while open. The breaker counts each call once,
+        # however many attempts it took, and only transient failures count:
+        # a bad ticker failing must not open the circuit for everyone.
+        if not self.breaker.allow():
+            metrics.upstream_requests.inc(call=name, status="circuit_open")
+            raise UpstreamUnavailable("Yahoo Finance is unavailable (circuit open)")
+        for attempt in range(self.retries + 1):
+            try:
+                self.bucket.acquire()
+            except UpstreamUnavailable:
+                self.breaker.release()
+                raise
+            try:
+                result = metrics.observe_upstream(name, fn, *args, **kwargs)
+            except Exception as e:
+                if metrics.upstream_status(e) not in RETRYABLE:
+                    self.breaker.release()
+                    raise
+                if attempt == self.retries:
+                    self.breaker.failure()
+                    raise
+                time.sleep(random.uniform(0, min(self.backoff_max, self.backoff * 2 ** attempt)))
+                continue
+            self.breaker.success()
+            return result
+
+    def status(self) -> dict:
+        return {
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "tokens": round(self.bucket.tokens, 2),
+            "rate_per_second": self.bucket.rate,
+            "burst": self.bucket.burst,
+        }
+
+
+upstream = UpstreamClient()